@@ -9,6 +9,9 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 
+from form_dispatch import dedupe_items
+from form_scheduler import FORM_EFFORT_BUDGET, schedule_translation
+
 
 # ------------------------------------------------------------
 # 1. AUTHENTICATION
@@ -130,6 +133,13 @@ LANGUAGES = {
 # 5. TRANSLATION ITEM BUILDER
 # ------------------------------------------------------------
 
+def source_id(row):
+    conv_raw = row["file"]          # "sw2005" or possibly "2005"
+    conv_num = int(str(conv_raw).replace("sw", ""))
+    conv = f"sw{conv_num:05d}"      # -> "sw02005"
+    return f"{conv}_{row['speaker']}_{row['turn']}"
+
+
 def make_translation_item(disfluent_text, item_number, target_language, ID):
     return {
         "title": f"[{ID}] Translation {item_number}",
@@ -156,7 +166,8 @@ def bulk_create(
     forms_service,
     drive_service=None,
     folder_id=None,
-    items_per_form=20
+    items_per_form=20,
+    effort_budget=None
 ):
     results = []
     item_mappings = []
@@ -164,11 +175,18 @@ def bulk_create(
     base_form = load_base_form()
     df = pd.read_csv("./data/translation-dataset-with-timestamps.csv")
 
-    # CHUNK DATASET
-    chunks = [
-        df.iloc[i:i + items_per_form]
-        for i in range(0, len(df), items_per_form)
-    ]
+    # DISPATCH EACH UNIQUE TEXT ONCE; THE MAPPING FANS IT BACK OUT
+    unique_df, members = dedupe_items(df, ["text_disfluent"])
+    print(f"{len(df)} rows -> {len(unique_df)} unique items")
+
+    # CHUNK DATASET (by estimated effort when a budget in minutes is given)
+    if effort_budget:
+        chunks = schedule_translation(unique_df, effort_budget)
+    else:
+        chunks = [
+            unique_df.iloc[i:i + items_per_form]
+            for i in range(0, len(unique_df), items_per_form)
+        ]
 
     for lang_code, lang_name in LANGUAGES.items():
         print(f"\n=== Creating forms for {lang_name} ({lang_code}) ===")
@@ -199,32 +217,30 @@ def bulk_create(
             })
 
             for q_num, (row_idx, row) in enumerate(chunk.iterrows(), start=1):
-                
-                # extract ID info
-                conv_raw = row["file"]          # "sw2005" or possibly "2005"
-                conv_num = int(conv_raw.replace("sw", ""))
-                conv = f"sw{conv_num:05d}"      # -> "sw02005"
-                ID = f"{conv}_{row['speaker']}_{row['turn']}"
-
                 items.append(
                     make_translation_item(
                         row["text_disfluent"],
                         q_num,
                         lang_name,
-                        ID
+                        source_id(row)
                     )
                 )
 
-                item_mappings.append({
-                    "language_code": lang_code,
-                    "language_name": lang_name,
-                    "form_uid": UID,
-                    "form_id": None,  # filled later
-                    "form_part": form_idx,
-                    "question_number": q_num,
-                    "source_row_index": int(row_idx),
-                    "source_id": ID
-                })
+                # one mapping row per dataset row sharing this item
+                shared = members[row["item_key"]]
+                for src_idx in shared:
+                    item_mappings.append({
+                        "language_code": lang_code,
+                        "language_name": lang_name,
+                        "form_uid": UID,
+                        "form_id": None,  # filled later
+                        "form_part": form_idx,
+                        "question_number": q_num,
+                        "source_row_index": int(src_idx),
+                        "source_id": source_id(df.loc[src_idx]),
+                        "item_key": row["item_key"],
+                        "shared_by": len(shared)
+                    })
             
             items.append({
                 "title": f"Completion Code",
@@ -280,7 +296,8 @@ if __name__ == "__main__":
         forms_service,
         drive_service,
         DRIVE_FOLDER_ID,
-        items_per_form=20
+        items_per_form=20,
+        effort_budget=FORM_EFFORT_BUDGET
     )
 
     print("\nDONE — Forms Created\n")
@@ -10,6 +10,9 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 
+from form_dispatch import collapse_whitespace, dedupe_items
+from form_scheduler import FORM_EFFORT_BUDGET, schedule_reannotation
+
 
 # ------------------------------------------------------------
 # 1. AUTHENTICATION
@@ -157,6 +160,7 @@ def bulk_create_reannotation(
     forms_service,
     drive_service=None,
     folder_id=None,
+    effort_budget=FORM_EFFORT_BUDGET,
 ):
     results = []
     item_mappings = []
@@ -170,14 +174,17 @@ def bulk_create_reannotation(
         if lang_df.empty:
             continue
 
-        # Only split if 30+ items, then split into two roughly equal halves
-        if len(lang_df) > 30:
-            mid = len(lang_df) // 2
-            chunks = [lang_df.iloc[:mid], lang_df.iloc[mid:]]
-        else:
-            chunks = [lang_df]
+        # Identical (reference, target) pairs are annotated once; the markup
+        # answer is copied back verbatim, so only whitespace may differ
+        unique_df, members = dedupe_items(lang_df, ["EN_disfluent", "Text"], collapse_whitespace)
+
+        # Pack items into forms of similar estimated effort (minutes)
+        chunks = schedule_reannotation(unique_df, effort_budget)
 
-        print(f"\n=== Creating reannotation forms for {lang_name} ({lang_code}) — {len(lang_df)} items ===")
+        print(
+            f"\n=== Creating reannotation forms for {lang_name} ({lang_code}) — "
+            f"{len(unique_df)} items for {len(lang_df)} targets ==="
+        )
 
         for form_idx, chunk in enumerate(chunks, start=1):
             UID = f"{lang_code}_R{form_idx}"
@@ -215,16 +222,21 @@ def bulk_create_reannotation(
                     )
                 )
 
-                item_mappings.append({
-                    "language_code": lang_code,
-                    "language_name": lang_name,
-                    "form_uid": UID,
-                    "form_id": None,
-                    "form_part": form_idx,
-                    "question_number": q_num,
-                    "source_id": row["ID"],
-                    "reason": row["Reason"]
-                })
+                shared = members[row["item_key"]]
+                for src_idx in shared:
+                    src = lang_df.loc[src_idx]
+                    item_mappings.append({
+                        "language_code": lang_code,
+                        "language_name": lang_name,
+                        "form_uid": UID,
+                        "form_id": None,
+                        "form_part": form_idx,
+                        "question_number": q_num,
+                        "source_id": src["ID"],
+                        "reason": src["Reason"],
+                        "item_key": row["item_key"],
+                        "shared_by": len(shared)
+                    })
 
             items.append({
                 "title": "Completion Code",
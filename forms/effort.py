@@ -0,0 +1,38 @@
+"""Estimated minutes per annotation item (stdlib only, shared with the scripts)."""
+
+import re
+
+
+# Minutes; one form should take roughly one hour (paper, section 2.2)
+FORM_EFFORT_BUDGET = 60.0
+
+BASE_MINUTES_PER_ITEM = 0.5
+EN_READ_CHARS_PER_MINUTE = 900
+TARGET_CHARS_PER_MINUTE = 300
+MINUTES_PER_SPAN = 0.15
+
+
+def is_missing(value):
+    """True for None, NaN and empty cells."""
+    return value is None or value != value or value == ""
+
+
+def count_spans(text):
+    if is_missing(text):
+        return 0
+    return len(re.findall(r"_([^_]+)_", str(text)))
+
+
+def estimate_effort(en_text, target_text="", span_count=None):
+    """Estimated minutes to read the English reference and mark/translate the target."""
+    en_text = "" if is_missing(en_text) else str(en_text)
+    target_text = "" if is_missing(target_text) else str(target_text)
+    if span_count is None:
+        span_count = count_spans(en_text)
+
+    return (
+        BASE_MINUTES_PER_ITEM
+        + len(en_text) / EN_READ_CHARS_PER_MINUTE
+        + len(target_text) / TARGET_CHARS_PER_MINUTE
+        + span_count * MINUTES_PER_SPAN
+    )
@@ -0,0 +1,167 @@
+"""Send each unique source text out once and fan the answers back to every row."""
+# python3 forms/form_dispatch.py [--exports CS_R1.csv ... --mapping data/reannotation_form_mapping.csv]
+
+import argparse
+import hashlib
+import os
+import re
+import unicodedata
+
+import pandas as pd
+
+
+# ------------------------------------------------------------
+# 1. ITEM KEYS
+# ------------------------------------------------------------
+
+KEY_LENGTH = 16
+TERMINAL = re.compile(r"[.?!…。？！]+$")
+
+
+def normalize_source(text):
+    """Case-, width- and punctuation-insensitive form of a source text.
+
+    Letters, digits, combining marks (Devanagari vowel signs) and the
+    _span_ markers are kept; other characters inside the text collapse to
+    one space, so "Uh-huh, yeah." and "uh huh yeah." are the same item.
+    Terminal punctuation is kept, so a question and a statement with the
+    same words stay separate items.
+    """
+    if pd.isna(text):
+        return ""
+    text = unicodedata.normalize("NFKC", str(text)).casefold().strip()
+    terminal = TERMINAL.search(text)
+    chars = [
+        ch if ch == "_" or unicodedata.category(ch)[0] in "LNM" else " "
+        for ch in text
+    ]
+    words = re.sub(r"\s+", " ", "".join(chars)).strip()
+    return words + (terminal.group() if terminal else "")
+
+
+def collapse_whitespace(text):
+    """Exact text up to runs of whitespace, for items whose answers are markup.
+
+    A reannotation answer is the item's own text with underscores added, so
+    it can only be shared by rows whose text is the same character for
+    character; whitespace is ignored when markups are compared anyway.
+    """
+    if pd.isna(text):
+        return ""
+    return re.sub(r"\s+", " ", str(text)).strip()
+
+
+def item_key(*texts, normalize=normalize_source):
+    """Content hash of the normalized texts that make up one form item."""
+    joined = "\x1f".join(normalize(t) for t in texts)
+    return hashlib.sha1(joined.encode("utf-8")).hexdigest()[:KEY_LENGTH]
+
+
+def dedupe_items(df, columns, normalize=normalize_source):
+    """Collapse rows whose `columns` normalize to the same text.
+
+    Returns (unique rows in first-seen order with an `item_key` column,
+    item_key -> list of all df index labels sharing it).
+    """
+    keys = [item_key(*(row[c] for c in columns), normalize=normalize) for _, row in df.iterrows()]
+
+    members = {}
+    for row_idx, key in zip(df.index, keys):
+        members.setdefault(key, []).append(row_idx)
+
+    unique = df.assign(item_key=keys).drop_duplicates("item_key")
+    return unique, members
+
+
+# ------------------------------------------------------------
+# 2. FAN-OUT
+# ------------------------------------------------------------
+
+ANNOTATOR_COLUMN = "Provide your Prolific ID in the box below."
+ITEM_TITLE = re.compile(r"^\[(?P<id>[^\]]+)\] (?:Annotation|Translation) (?P<number>\d+)$")
+
+
+def export_answers(export, form_uid, annotator_column=ANNOTATOR_COLUMN, anonymous_prefix=None):
+    """Long (form_uid, question_number, title_id, annotator, answer) rows from a wide export.
+
+    A Google Forms response export has one row per respondent and one
+    column per question, titled "[ID] Annotation N" or "[ID] Translation N";
+    N is the question_number in the mapping CSV. Respondents without an ID
+    are named `<prefix>#<row>`.
+    """
+    prefix = anonymous_prefix or form_uid
+    items = {col: ITEM_TITLE.match(col) for col in export.columns if ITEM_TITLE.match(col)}
+
+    rows = []
+    for i, (_, resp) in enumerate(export.iterrows(), start=1):
+        annotator = resp.get(annotator_column)
+        if pd.isna(annotator) or not str(annotator).strip():
+            annotator = f"{prefix}#{i}"
+        for col, match in items.items():
+            if pd.isna(resp[col]):
+                continue
+            rows.append({
+                "form_uid": form_uid,
+                "question_number": int(match.group("number")),
+                "title_id": match.group("id"),
+                "annotator": str(annotator).strip(),
+                "answer": resp[col],
+            })
+    return pd.DataFrame(rows, columns=["form_uid", "question_number", "title_id", "annotator", "answer"])
+
+
+def fan_out_answers(answers, mapping):
+    """One answer row per source row.
+
+    `answers` comes from export_answers; the mapping CSV lists every source
+    row under the form question its item was sent as, so a merge copies
+    each answer to all rows that share it.
+    """
+    return mapping.merge(answers, on=["form_uid", "question_number"], how="inner")
+
+
+def duplication_summary(df, columns, group=None, normalize=normalize_source):
+    """Rows, unique items and the share of dispatches saved, per group."""
+    parts = df.groupby(group, sort=True) if group else [("all", df)]
+
+    rows = []
+    for name, part in parts:
+        unique, _ = dedupe_items(part, columns, normalize)
+        rows.append({
+            "group": name,
+            "rows": len(part),
+            "unique_items": len(unique),
+            "saved_%": round(100 * (1 - len(unique) / len(part)), 1) if len(part) else 0.0,
+        })
+    return pd.DataFrame(rows)
+
+
+# ------------------------------------------------------------
+# 3. PREVIEW / FAN-OUT ENTRY POINT
+# ------------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--exports", nargs="+", help="Google Forms response CSVs named <form_uid>.csv")
+    parser.add_argument("--mapping", default="./data/form_item_mapping.csv")
+    parser.add_argument("--output", default="./data/form_answers_by_row.csv")
+    args = parser.parse_args()
+
+    if args.exports:
+        answers = pd.concat([
+            export_answers(pd.read_csv(path), os.path.splitext(os.path.basename(path))[0])
+            for path in args.exports
+        ], ignore_index=True)
+        mapping = pd.read_csv(args.mapping)
+        by_row = fan_out_answers(answers, mapping)
+        by_row.to_csv(args.output, index=False, encoding="utf-8")
+        print(f"{len(answers)} answers -> {len(by_row)} rows")
+        print(f"✓ Saved to {args.output}")
+    else:
+        df = pd.read_csv("./data/uh-mazing.csv")
+        print("\n=== Translation sources (EN_disfluent) ===")
+        print(duplication_summary(df, ["EN_disfluent"]).to_string(index=False))
+
+        targets = pd.read_csv("./outputs/results/reannotation_targets.csv")
+        print("\n=== Reannotation targets (EN_disfluent + Text) ===")
+        print(duplication_summary(targets, ["EN_disfluent", "Text"], "Language", collapse_whitespace).to_string(index=False))
@@ -0,0 +1,107 @@
+"""Pack annotation items into forms of similar estimated effort."""
+# python3 forms/form_scheduler.py
+
+import heapq
+import math
+
+import pandas as pd
+
+from effort import FORM_EFFORT_BUDGET, estimate_effort
+
+
+# ------------------------------------------------------------
+# 1. BIN PACKING
+# ------------------------------------------------------------
+
+def _lpt(efforts, order, n_forms, budget):
+    """Place items on the least loaded of `n_forms` forms; None if one overflows."""
+    heap = [(0.0, form_idx) for form_idx in range(n_forms)]
+    forms = [[] for _ in range(n_forms)]
+
+    for i in order:
+        load, form_idx = heap[0]
+        if load > 0 and load + efforts[i] > budget:
+            return None
+        heapq.heapreplace(heap, (load + efforts[i], form_idx))
+        forms[form_idx].append(i)
+
+    return forms
+
+
+def pack_items(efforts, budget=FORM_EFFORT_BUDGET):
+    """Assign item indices to forms under a per-form effort budget.
+
+    Longest-processing-time first: items are placed in decreasing effort
+    order onto the least loaded form, starting from the minimum number of
+    forms the budget allows and adding one form until nothing overflows.
+    An item larger than the budget ends up alone on its form. Within a
+    form, items keep their input order.
+    """
+    if not efforts:
+        return []
+
+    order = sorted(range(len(efforts)), key=lambda i: efforts[i], reverse=True)
+    n_forms = max(1, math.ceil(sum(efforts) / budget))
+
+    forms = _lpt(efforts, order, n_forms, budget)
+    while forms is None:
+        n_forms += 1
+        forms = _lpt(efforts, order, n_forms, budget)
+
+    return [sorted(form) for form in forms if form]
+
+
+def schedule_reannotation(lang_df, budget=FORM_EFFORT_BUDGET):
+    """Split one language's reannotation targets into effort-balanced chunks."""
+    efforts = [
+        estimate_effort(row["EN_disfluent"], row["Text"])
+        for _, row in lang_df.iterrows()
+    ]
+    return [lang_df.iloc[form] for form in pack_items(efforts, budget)]
+
+
+def schedule_translation(df, budget=FORM_EFFORT_BUDGET):
+    """Split the translation dataset into effort-balanced chunks."""
+    efforts = [
+        estimate_effort(row["text_disfluent"], row["text_disfluent"])
+        for _, row in df.iterrows()
+    ]
+    return [df.iloc[form] for form in pack_items(efforts, budget)]
+
+
+def form_efforts(chunk, en_col="EN_disfluent", target_col="Text"):
+    return sum(
+        estimate_effort(row[en_col], row[target_col])
+        for _, row in chunk.iterrows()
+    )
+
+
+# ------------------------------------------------------------
+# 2. PLAN PREVIEW
+# ------------------------------------------------------------
+
+if __name__ == "__main__":
+    df = pd.read_csv("./outputs/results/reannotation_targets.csv")
+
+    for lang_code in sorted(df["Language"].unique()):
+        lang_df = df[df["Language"] == lang_code]
+
+        if len(lang_df) > 30:
+            mid = len(lang_df) // 2
+            halves = [lang_df.iloc[:mid], lang_df.iloc[mid:]]
+        else:
+            halves = [lang_df]
+
+        chunks = schedule_reannotation(lang_df)
+        old = [form_efforts(c) for c in halves]
+        new = [form_efforts(c) for c in chunks]
+
+        print(f"\n=== {lang_code} — {len(lang_df)} items, {sum(new):.0f} min total ===")
+        print(
+            f"  fixed split: {len(halves)} forms, "
+            f"{', '.join(f'{m:.0f}' for m in old)} min (slowest {max(old):.0f})"
+        )
+        print(
+            f"  scheduled:   {len(chunks)} forms, "
+            f"{', '.join(f'{m:.0f}' for m in new)} min (slowest {max(new):.0f})"
+        )
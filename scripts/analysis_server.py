@@ -0,0 +1,202 @@
+"""Long-running local analysis server that keeps the dataset warm in memory."""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from detect_annotation_errors import analyze_sample, extract_underscored_tokens
+from token_index import TokenIndex, build_index
+
+# Configuration
+DATA_FILE = 'data/uh-mazing.csv'
+HOST = '127.0.0.1'
+PORT = 8765
+TOP_N = 15
+
+
+class Snapshot:
+    """One immutable load of the dataset: spans, counters, errors and the token index."""
+
+    def __init__(self, df, counters, errors, index, signature):
+        self.df = df
+        self.counters = counters
+        self.errors = errors
+        self.index = index
+        self.signature = signature
+        self.loaded_at = time.time()
+
+    # --------------------------------------------------------
+    # QUERIES
+    # --------------------------------------------------------
+
+    def stats(self, lang=None, top_n=TOP_N):
+        langs = [lang] if lang else sorted(self.counters)
+        errors_by_lang = Counter(e['Language'] for e in self.errors)
+        result = {}
+        for code in langs:
+            counter = self.counters.get(code, Counter())
+            result[code] = {
+                'samples': int(self.df[f'{code}_disfluent'].notna().sum()),
+                'total_tokens': sum(counter.values()),
+                'unique_tokens': len(counter),
+                'errors': errors_by_lang.get(code, 0),
+                'top_tokens': counter.most_common(top_n),
+            }
+        return result
+
+    def error_list(self, lang=None):
+        return [e for e in self.errors if lang is None or e['Language'] == lang]
+
+    def tokens(self, query, lang=None, mode='exact', target=None):
+        if target:
+            return self.index.cross_language(query, lang, target)
+        if mode == 'prefix':
+            return self.index.prefix(query, lang)
+        return self.index.exact(query, lang)
+
+
+class AnalysisState:
+    """The current Snapshot, swapped for a new one when the CSV changes.
+
+    Handlers take `current` once per request, so a reload never exposes a
+    mix of old and new data; a reload that fails (e.g. the file is still
+    being written) keeps the previous snapshot serving.
+    """
+
+    def __init__(self, data_file=DATA_FILE):
+        self.data_file = data_file
+        self.lock = threading.Lock()
+        self.failed_signature = None
+        self.current = self.load(self._stat_signature())
+
+    def _stat_signature(self):
+        stat = os.stat(self.data_file)
+        return (stat.st_mtime, stat.st_size)
+
+    def load(self, signature):
+        start = time.perf_counter()
+        df = pd.read_csv(self.data_file)
+
+        counters = {}
+        for col in df.columns:
+            if col.endswith('_disfluent'):
+                tokens = []
+                for text in df[col].dropna():
+                    tokens.extend(t.lower() for t in extract_underscored_tokens(text))
+                counters[col.replace('_disfluent', '')] = Counter(tokens)
+
+        errors = []
+        for _, row in df.iterrows():
+            for error in analyze_sample(row):
+                text = str(row[f"{error['Language']}_disfluent"])
+                error['Token'] = text[error['Start']:error['End']]
+                errors.append(error)
+
+        snapshot = Snapshot(df, counters, errors, TokenIndex(build_index(df)), signature)
+        print(f"Loaded {len(df)} samples in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return snapshot
+
+    def refresh(self):
+        """Reload if the dataset changed on disk since the last load; returns the current snapshot."""
+        try:
+            signature = self._stat_signature()
+        except OSError:
+            return self.current
+        if signature in (self.current.signature, self.failed_signature):
+            return self.current
+
+        with self.lock:
+            if signature not in (self.current.signature, self.failed_signature):
+                try:
+                    self.current = self.load(signature)
+                except Exception as exc:
+                    # Retried once the file changes again
+                    self.failed_signature = signature
+                    print(f"Reload failed, still serving the previous load: {exc}")
+        return self.current
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            start = time.perf_counter()
+            url = urlparse(self.path)
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            lang = params.get('lang')
+
+            snapshot = state.refresh()
+
+            for name in ['lang', 'target']:
+                if params.get(name) and params[name] not in snapshot.counters:
+                    self._send(400, {'error': f'unknown {name}: {params[name]}',
+                                     'languages': sorted(snapshot.counters)})
+                    return
+
+            if url.path == '/stats':
+                try:
+                    top_n = int(params.get('top', TOP_N))
+                    if top_n < 0:
+                        raise ValueError
+                except ValueError:
+                    self._send(400, {'error': f"top must be a non-negative integer, got {params['top']!r}"})
+                    return
+                data = snapshot.stats(lang, top_n)
+            elif url.path == '/errors':
+                data = snapshot.error_list(lang)
+            elif url.path == '/tokens':
+                if 'q' not in params:
+                    self._send(400, {'error': 'missing q parameter'})
+                    return
+                if params.get('target') and not lang:
+                    self._send(400, {'error': 'target requires lang'})
+                    return
+                data = snapshot.tokens(params['q'], lang, params.get('mode', 'exact'),
+                                    params.get('target'))
+            else:
+                self._send(404, {'error': f'unknown endpoint: {url.path}',
+                                 'endpoints': ['/stats', '/errors', '/tokens']})
+                return
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._send(200, {'elapsed_ms': round(elapsed_ms, 3), 'data': data})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    args = parser.parse_args()
+
+    state = AnalysisState()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    print(f"Serving on http://{args.host}:{args.port} (/stats, /errors, /tokens)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
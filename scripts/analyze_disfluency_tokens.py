@@ -1,20 +1,29 @@
 """Extract and visualize the most common disfluency tokens per language."""
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
+import argparse
+import csv
 import re
 from collections import Counter
 import os
 
+from span_types import TYPES, SpanClassifier
+
 # Configuration
 TOP_N = 15
+DATA_FILE = 'data/uh-mazing.csv'
 OUTPUT_DIR = 'outputs/figures'
+RESULTS_DIR = 'outputs/results'
 CASE_SENSITIVE = False
 
+
+def is_missing(value):
+    """True for None, NaN and the empty cells the csv module yields."""
+    return value is None or value != value or value == ''
+
+
 def extract_underscored_tokens(text):
     """Extract tokens between underscores."""
-    if pd.isna(text):
+    if is_missing(text):
         return []
 
     tokens = re.findall(r'_([^_]+)_', str(text))
@@ -27,6 +36,8 @@ def extract_underscored_tokens(text):
 
 def get_font_properties(lang):
     """Get font properties for special scripts."""
+    import matplotlib.font_manager as fm
+
     font_paths = {
         'ZH': os.path.expanduser('~/.local/share/fonts/noto/NotoSansCJKsc-Regular.otf'),
         'HI': os.path.expanduser('~/.local/share/fonts/noto/NotoSansDevanagari-Regular.ttf'),
@@ -41,6 +52,8 @@ def get_font_properties(lang):
 
 def configure_fonts_for_language(lang):
     """Configure fonts for special scripts."""
+    import matplotlib.pyplot as plt
+
     font_config = {
         'ZH': ['Noto Sans CJK SC', 'Noto Sans CJK TC', 'SimHei', 'Microsoft YaHei'],
         'HI': ['Noto Sans Devanagari', 'Mangal', 'Noto Sans'],
@@ -55,9 +68,30 @@ def configure_fonts_for_language(lang):
         plt.rcParams['axes.unicode_minus'] = True
 
 
-def analyze_disfluencies_per_language(df):
-    """Extract and count disfluency tokens per language."""
-    disfluent_cols = [col for col in df.columns if col.endswith('_disfluent')]
+def classify_tokens_per_language(rows, classifier=None):
+    """Count the span type of every token occurrence, per language.
+
+    Tokens take the type of the phrase they belong to; punctuation-only
+    spans belong to no phrase and stay untyped.
+    """
+    classifier = classifier or SpanClassifier()
+    disfluent_cols = [col for col in rows[0] if col.endswith('_disfluent')] if rows else []
+
+    token_types = {}
+    for col in disfluent_cols:
+        lang = col.replace('_disfluent', '')
+        types = token_types.setdefault(lang, {})
+        for row in rows:
+            for _, label, raw_tokens in classifier.classify(row[col], lang):
+                for token in raw_tokens:
+                    types.setdefault(token if CASE_SENSITIVE else token.lower(), Counter())[label] += 1
+
+    return token_types
+
+
+def analyze_disfluencies_per_language(rows):
+    """Extract and count disfluency tokens per language from row dicts."""
+    disfluent_cols = [col for col in rows[0] if col.endswith('_disfluent')] if rows else []
 
     language_disfluencies = {}
 
@@ -65,8 +99,8 @@ def analyze_disfluencies_per_language(df):
         lang = col.replace('_disfluent', '')
 
         all_tokens = []
-        for text in df[col].dropna():
-            tokens = extract_underscored_tokens(text)
+        for row in rows:
+            tokens = extract_underscored_tokens(row[col])
             all_tokens.extend(tokens)
 
         token_counts = Counter(all_tokens)
@@ -79,6 +113,8 @@ def analyze_disfluencies_per_language(df):
 
 def create_disfluency_chart(lang, token_counts, top_n=TOP_N):
     """Create bar chart of top disfluency tokens."""
+    import matplotlib.pyplot as plt
+
     configure_fonts_for_language(lang)
 
     top_tokens = token_counts.most_common(top_n)
@@ -124,6 +160,8 @@ def create_disfluency_chart(lang, token_counts, top_n=TOP_N):
 
 def create_summary_comparison(language_disfluencies):
     """Create summary chart comparing disfluencies across languages."""
+    import matplotlib.pyplot as plt
+
     langs = []
     unique_counts = []
     total_counts = []
@@ -175,38 +213,81 @@ def create_summary_comparison(language_disfluencies):
     plt.close()
 
 
-def save_token_frequencies(language_disfluencies):
-    """Save token frequency tables to CSV."""
+def save_token_frequencies(language_disfluencies, token_types=None):
+    """Save token frequency tables to CSV, with each token's majority span type."""
+    token_types = token_types or {}
     for lang, counter in language_disfluencies.items():
-        df = pd.DataFrame(counter.most_common(), columns=['Token', 'Frequency'])
-        output_path = os.path.join('outputs/results', f'disfluency_tokens_{lang}.csv')
-        df.to_csv(output_path, index=False)
+        types = token_types.get(lang, {})
+        output_path = os.path.join(RESULTS_DIR, f'disfluency_tokens_{lang}.csv')
+        with open(output_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(['Token', 'Frequency', 'Type'])
+            for token, frequency in counter.most_common():
+                label = types[token].most_common(1)[0][0] if token in types else ''
+                writer.writerow([token, frequency, label])
         print(f"Saved: {output_path}")
 
 
-def main():
+def run(charts=True, by_cluster=False):
+    """Count tokens per language, optionally chart them, and save the tables.
+
+    With `by_cluster`, near-duplicate variants (`ehm`, ` ehm `, `, ehm`)
+    are merged into MinHash clusters before charting, and cluster tables
+    are written next to the raw token tables.
+    """
     print("Loading dataset...")
-    df = pd.read_csv('data/uh-mazing.csv')
-    print(f"Loaded {len(df)} samples\n")
+    with open(DATA_FILE, 'r', encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    print(f"Loaded {len(rows)} samples\n")
 
     print("Extracting disfluency tokens...")
-    language_disfluencies = analyze_disfluencies_per_language(df)
+    language_disfluencies = analyze_disfluencies_per_language(rows)
     print()
 
-    print(f"Creating charts (top {TOP_N} per language)...")
-    for lang, token_counts in sorted(language_disfluencies.items()):
-        create_disfluency_chart(lang, token_counts, top_n=TOP_N)
+    raw_disfluencies = language_disfluencies
+    if by_cluster:
+        from span_clusters import cluster_counts, save_clusters
+
+        print("Clustering near-duplicate variants...")
+        clustered = {}
+        for lang, counter in sorted(raw_disfluencies.items()):
+            clustered[lang], mapping = cluster_counts(counter)
+            print(f"{lang}: {len(counter)} variants -> {len(clustered[lang])} clusters")
+            print(f"Saved: {save_clusters(lang, clustered[lang], mapping, counter)}")
+        language_disfluencies = clustered
+        print()
+
+    print("Token occurrences by span type (INTJ / PRN / EDITED)...")
+    token_types = classify_tokens_per_language(rows)
+    for lang, types in sorted(token_types.items()):
+        totals = Counter()
+        for counts in types.values():
+            totals.update(counts)
+        print(f"{lang}: " + ', '.join(f"{t} {totals[t]}" for t in TYPES))
     print()
 
-    print("Creating summary comparison...")
-    create_summary_comparison(language_disfluencies)
-    print()
+    if charts:
+        print(f"Creating charts (top {TOP_N} per language)...")
+        for lang, token_counts in sorted(language_disfluencies.items()):
+            create_disfluency_chart(lang, token_counts, top_n=TOP_N)
+        print()
+
+        print("Creating summary comparison...")
+        create_summary_comparison(language_disfluencies)
+        print()
 
     print("Saving token frequency tables...")
-    save_token_frequencies(language_disfluencies)
+    save_token_frequencies(raw_disfluencies, token_types)
     print()
 
 
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--by-cluster', action='store_true',
+                        help='chart near-duplicate variants as one MinHash cluster')
+    args = parser.parse_args()
+    run(charts=True, by_cluster=args.by_cluster)
+
 
 if __name__ == '__main__':
     main()
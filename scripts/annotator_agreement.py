@@ -0,0 +1,279 @@
+"""Span-level inter-annotator agreement for disfluency reannotations."""
+
+import glob
+import os
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+FORMS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'forms')
+if FORMS_DIR not in sys.path:
+    sys.path.insert(0, FORMS_DIR)
+
+from form_dispatch import export_answers, fan_out_answers
+
+# Configuration
+DATA_FILE = 'data/uh-mazing.csv'
+RESPONSES_DIR = 'data/reannotation_responses'
+MAPPING_FILE = 'data/reannotation_form_mapping.csv'
+OUTPUT_DIR = 'outputs/results'
+ORIGINAL = 'original'
+
+
+# ------------------------------------------------------------
+# MARKUP PARSING
+# ------------------------------------------------------------
+
+def parse_markup(text):
+    """Return (characters, spans) for an underscore-marked text.
+
+    Offsets index the non-whitespace characters of the text with markers
+    removed, so two markups of the same sentence line up even when
+    annotators spaced the underscores differently. Spans are half-open
+    (start, end) pairs in document order.
+    """
+    parts = str(text).split('_')
+    # An odd number of underscores leaves the last span unclosed; treat it as text
+    closed = len(parts) if len(parts) % 2 == 1 else len(parts) - 1
+
+    chars = []
+    spans = []
+    for i, part in enumerate(parts):
+        visible = re.sub(r'\s+', '', part)
+        start = len(chars)
+        chars.extend(visible)
+        if i % 2 == 1 and i < closed and visible:
+            spans.append((start, len(chars)))
+
+    return ''.join(chars), spans
+
+
+class SpanSet:
+    """Sorted, non-overlapping spans supporting O(log n) overlap queries."""
+
+    def __init__(self, spans):
+        self.spans = sorted(spans)
+        self.starts = [s for s, _ in self.spans]
+        self.ends = [e for _, e in self.spans]
+        self.exact = set(self.spans)
+
+    def __len__(self):
+        return len(self.spans)
+
+    def overlap_count(self, start, end):
+        """Number of spans overlapping [start, end)."""
+        lo = bisect_right(self.ends, start)
+        hi = bisect_left(self.starts, end)
+        return max(0, hi - lo)
+
+
+# ------------------------------------------------------------
+# AGREEMENT METRICS
+# ------------------------------------------------------------
+
+def compare_markups(ref_spans, hyp_spans, n_chars):
+    """Count span matches and the character-level confusion matrix."""
+    ref = SpanSet(ref_spans)
+    hyp = SpanSet(hyp_spans)
+
+    exact = len(ref.exact & hyp.exact)
+    hyp_overlapping = sum(1 for s, e in hyp.spans if ref.overlap_count(s, e) > 0)
+    ref_overlapping = sum(1 for s, e in ref.spans if hyp.overlap_count(s, e) > 0)
+
+    ref_mask = np.zeros(n_chars, dtype=bool)
+    hyp_mask = np.zeros(n_chars, dtype=bool)
+    for s, e in ref.spans:
+        ref_mask[s:e] = True
+    for s, e in hyp.spans:
+        hyp_mask[s:e] = True
+
+    return {
+        'ref_spans': len(ref),
+        'hyp_spans': len(hyp),
+        'exact_matches': exact,
+        'hyp_overlapping': hyp_overlapping,
+        'ref_overlapping': ref_overlapping,
+        'both_in': int(np.sum(ref_mask & hyp_mask)),
+        'ref_only': int(np.sum(ref_mask & ~hyp_mask)),
+        'hyp_only': int(np.sum(~ref_mask & hyp_mask)),
+        'both_out': int(np.sum(~ref_mask & ~hyp_mask)),
+    }
+
+
+def safe_div(num, den):
+    return num / den if den else 0.0
+
+
+def f1(p, r):
+    return safe_div(2 * p * r, p + r)
+
+
+def cohen_kappa(both_in, ref_only, hyp_only, both_out):
+    total = both_in + ref_only + hyp_only + both_out
+    if total == 0:
+        return 0.0
+    observed = (both_in + both_out) / total
+    p_ref = (both_in + ref_only) / total
+    p_hyp = (both_in + hyp_only) / total
+    expected = p_ref * p_hyp + (1 - p_ref) * (1 - p_hyp)
+    return safe_div(observed - expected, 1 - expected) if expected < 1 else 1.0
+
+
+def summarize(counts):
+    """Turn summed match counts into precision/recall/F1 and kappa."""
+    exact_p = safe_div(counts['exact_matches'], counts['hyp_spans'])
+    exact_r = safe_div(counts['exact_matches'], counts['ref_spans'])
+    overlap_p = safe_div(counts['hyp_overlapping'], counts['hyp_spans'])
+    overlap_r = safe_div(counts['ref_overlapping'], counts['ref_spans'])
+    return {
+        'Exact_P': round(exact_p, 4),
+        'Exact_R': round(exact_r, 4),
+        'Exact_F1': round(f1(exact_p, exact_r), 4),
+        'Overlap_P': round(overlap_p, 4),
+        'Overlap_R': round(overlap_r, 4),
+        'Overlap_F1': round(f1(overlap_p, overlap_r), 4),
+        'Char_Kappa': round(cohen_kappa(counts['both_in'], counts['ref_only'],
+                                        counts['hyp_only'], counts['both_out']), 4),
+    }
+
+
+# ------------------------------------------------------------
+# CAMPAIGN LOADING
+# ------------------------------------------------------------
+
+def load_form_export(path, language, mapping=None):
+    """Read a Google Forms response export into (ID, Language, Annotator, Text) rows.
+
+    The export is named after its form UID. When the dispatch mapping lists
+    that form, each answer goes to every source row that shared the
+    question's item; otherwise the ID comes from the `[ID]` in the title.
+    """
+    form_uid = os.path.splitext(os.path.basename(path))[0]
+    answers = export_answers(pd.read_csv(path), form_uid, anonymous_prefix=os.path.basename(path))
+
+    if mapping is not None and form_uid in set(mapping['form_uid']):
+        answers = fan_out_answers(answers, mapping)
+        ids = answers['source_id']
+    else:
+        ids = answers['title_id']
+
+    return [
+        {'ID': sample_id, 'Language': language, 'Annotator': annotator, 'Text': text}
+        for sample_id, annotator, text in zip(ids, answers['annotator'], answers['answer'])
+    ]
+
+
+def load_campaign(responses_dir=RESPONSES_DIR, data_file=DATA_FILE, mapping_file=MAPPING_FILE):
+    """Collect every markup per (ID, Language), including the original annotation.
+
+    Export files are named after the form UID (e.g. `CS_R1.csv`), so the
+    language is the UID prefix.
+    """
+    mapping = pd.read_csv(mapping_file) if mapping_file and os.path.exists(mapping_file) else None
+
+    rows = []
+    for path in sorted(glob.glob(os.path.join(responses_dir, '*.csv'))):
+        language = os.path.basename(path).split('_')[0]
+        rows.extend(load_form_export(path, language, mapping))
+
+    markups = defaultdict(dict)
+    for row in rows:
+        markups[(row['ID'], row['Language'])][row['Annotator']] = row['Text']
+
+    df = pd.read_csv(data_file)
+    for _, row in df.iterrows():
+        for col in row.index:
+            if not col.endswith('_disfluent') or col == 'EN_disfluent':
+                continue
+            key = (row['ID'], col.replace('_disfluent', ''))
+            if key in markups and not pd.isna(row[col]):
+                markups[key][ORIGINAL] = row[col]
+
+    return markups
+
+
+def score_campaign(markups):
+    """Compare every pair of markups of every item in one pass."""
+    pair_rows = []
+    mismatched = 0
+
+    for (sample_id, lang), by_annotator in markups.items():
+        parsed = {name: parse_markup(text) for name, text in by_annotator.items()}
+
+        for a, b in combinations(sorted(parsed), 2):
+            # The original is always the reference side of a comparison
+            if b == ORIGINAL:
+                a, b = b, a
+            chars_a, spans_a = parsed[a]
+            chars_b, spans_b = parsed[b]
+            if chars_a != chars_b:
+                mismatched += 1
+                continue
+
+            counts = compare_markups(spans_a, spans_b, len(chars_a))
+            pair_rows.append(dict(ID=sample_id, Language=lang, Reference=a, Annotator=b, **counts))
+
+    return pd.DataFrame(pair_rows), mismatched
+
+
+def aggregate(pairs, keys):
+    """Micro-average pair counts over groups."""
+    count_cols = ['ref_spans', 'hyp_spans', 'exact_matches', 'hyp_overlapping',
+                  'ref_overlapping', 'both_in', 'ref_only', 'hyp_only', 'both_out']
+    rows = []
+    for group, sub in pairs.groupby(keys):
+        group = group if isinstance(group, tuple) else (group,)
+        totals = sub[count_cols].sum().to_dict()
+        row = dict(zip(keys, group))
+        row['Pairs'] = len(sub)
+        row.update(summarize(totals))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def both_directions(pairs):
+    """Add each inter-annotator pair seen from the other annotator's side."""
+    inter = pairs[pairs['Reference'] != ORIGINAL]
+    flipped = inter.rename(columns={
+        'Reference': 'Annotator', 'Annotator': 'Reference',
+        'ref_spans': 'hyp_spans', 'hyp_spans': 'ref_spans',
+        'ref_overlapping': 'hyp_overlapping', 'hyp_overlapping': 'ref_overlapping',
+        'ref_only': 'hyp_only', 'hyp_only': 'ref_only',
+    })
+    return pd.concat([pairs, flipped], ignore_index=True)
+
+
+def main():
+    print("Loading reannotation campaign...")
+    markups = load_campaign()
+    multi = sum(1 for m in markups.values() if len(m) > 1)
+    print(f"Loaded {len(markups)} (ID, Language) items, {multi} with 2+ markups\n")
+
+    pairs, mismatched = score_campaign(markups)
+    if mismatched:
+        print(f"Skipped {mismatched} pairs whose underlying text differs\n")
+    if pairs.empty:
+        print("No comparable markup pairs found.")
+        return
+
+    pairs['Pair_Type'] = np.where(pairs['Reference'] == ORIGINAL, 'vs_original', 'inter_annotator')
+    by_language = aggregate(pairs, ['Language', 'Pair_Type'])
+    by_annotator = aggregate(both_directions(pairs), ['Annotator', 'Pair_Type'])
+
+    print("Agreement by language:")
+    print(by_language.to_string(index=False))
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    pairs.to_csv(os.path.join(OUTPUT_DIR, 'agreement_pairs.csv'), index=False)
+    by_language.to_csv(os.path.join(OUTPUT_DIR, 'agreement_by_language.csv'), index=False)
+    by_annotator.to_csv(os.path.join(OUTPUT_DIR, 'agreement_by_annotator.csv'), index=False)
+    print(f"\n✓ Saved agreement tables to: {OUTPUT_DIR}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+"""Bit-parallel WER/CER of ASR transcripts against EN_disfluent, inside and outside spans."""
+
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from validate_en_gold import WORD, tokenize_marked
+
+# Configuration
+DATA_FILE = 'data/uh-mazing.csv'
+ASR_DIR = 'outputs/results/asr'
+OUTPUT_FILE = 'outputs/results/asr_wer.csv'
+CHUNK_SIZE = 256
+
+COUNT_FIELDS = ['Ref', 'Ref_In', 'Ref_Out', 'Sub', 'Del', 'Ins',
+                'Errors_In', 'Errors_Out', 'Fluent_Ref', 'Fluent_Errors']
+
+
+# ------------------------------------------------------------
+# BIT-PARALLEL EDIT DISTANCE
+# ------------------------------------------------------------
+
+def encode(*sequences):
+    """Map tokens to small integers shared across the given sequences."""
+    vocab = {}
+    return [[vocab.setdefault(tok, len(vocab)) for tok in seq] for seq in sequences]
+
+
+def bit_columns(ref, hyp):
+    """Myers/Hyyrö bit-vector columns of the Levenshtein matrix.
+
+    The reference is the pattern: bit i of a column describes row i + 1.
+    Returns one (VP, VN) pair per hypothesis position, column 0 included,
+    where VP/VN mark +1/-1 vertical steps. Python ints act as bitvectors of
+    any length, so long references need no blocking.
+    """
+    m = len(ref)
+    full = (1 << m) - 1
+    peq = {}
+    for i, tok in enumerate(ref):
+        peq[tok] = peq.get(tok, 0) | (1 << i)
+
+    vp, vn = full, 0
+    columns = [(vp, vn)]
+    for tok in hyp:
+        eq = peq.get(tok, 0)
+        xv = eq | vn
+        xh = (((eq & vp) + vp) ^ vp) | eq
+        hp = vn | (~(xh | vp) & full)
+        hn = vp & xh
+        # Global distance: the top row grows by one per hypothesis token
+        hp = ((hp << 1) | 1) & full
+        hn = (hn << 1) & full
+        vp = hn | (~(xv | hp) & full)
+        vn = hp & xv
+        columns.append((vp, vn))
+    return columns
+
+
+def cell(columns, i, j):
+    """D[i][j] from the column's vertical deltas: j + popcount(VP) - popcount(VN) over rows 1..i."""
+    vp, vn = columns[j]
+    mask = (1 << i) - 1
+    return j + (vp & mask).bit_count() - (vn & mask).bit_count()
+
+
+def edit_distance(ref, hyp):
+    if not ref:
+        return len(hyp)
+    return cell(bit_columns(ref, hyp), len(ref), len(hyp))
+
+
+def align(ref, hyp):
+    """Backtrace one optimal alignment as ('=', '*', '-', '+') ops with ref/hyp indices."""
+    columns = bit_columns(ref, hyp)
+    ops = []
+    i, j = len(ref), len(hyp)
+    d = cell(columns, i, j)
+
+    while i > 0 or j > 0:
+        if i > 0 and j > 0:
+            cost = 0 if ref[i - 1] == hyp[j - 1] else 1
+            if cell(columns, i - 1, j - 1) + cost == d:
+                ops.append(('=' if cost == 0 else '*', i - 1, j - 1))
+                i, j, d = i - 1, j - 1, d - cost
+                continue
+        if i > 0 and cell(columns, i - 1, j) + 1 == d:
+            ops.append(('-', i - 1, None))
+            i, d = i - 1, d - 1
+        else:
+            ops.append(('+', None, j - 1))
+            j, d = j - 1, d - 1
+
+    ops.reverse()
+    return ops
+
+
+# ------------------------------------------------------------
+# SCORING
+# ------------------------------------------------------------
+
+def score(ref, in_span, hyp):
+    """Error counts for one segment, split by whether the reference token is in a span.
+
+    Insertions count toward the span status of the preceding reference
+    token (the following one at the very start).
+    """
+    ref_ids, hyp_ids = encode(ref, hyp)
+    counts = dict.fromkeys(COUNT_FIELDS, 0)
+    counts['Ref'] = len(ref)
+    counts['Ref_In'] = sum(in_span)
+    counts['Ref_Out'] = len(ref) - counts['Ref_In']
+
+    last_flag = in_span[0] if in_span else False
+    for op, i, _ in align(ref_ids, hyp_ids):
+        if i is not None:
+            last_flag = in_span[i]
+        if op == '=':
+            continue
+        counts[{'*': 'Sub', '-': 'Del', '+': 'Ins'}[op]] += 1
+        counts['Errors_In' if last_flag else 'Errors_Out'] += 1
+
+    # Same hypothesis scored as if the spans had never been transcribed
+    fluent_ref = [tok for tok, flag in zip(ref_ids, in_span) if not flag]
+    counts['Fluent_Ref'] = len(fluent_ref)
+    counts['Fluent_Errors'] = edit_distance(fluent_ref, hyp_ids)
+    return counts
+
+
+def chars_with_flags(words, flags):
+    """Characters of the space-joined words; a space takes its left word's flag."""
+    chars, char_flags = [], []
+    for k, (word, flag) in enumerate(zip(words, flags)):
+        if k:
+            chars.append(' ')
+            char_flags.append(flags[k - 1])
+        chars.extend(word)
+        char_flags.extend([flag] * len(word))
+    return chars, char_flags
+
+
+def score_segment(reference, hypothesis):
+    """Word and character counts for one (marked reference, hypothesis) pair."""
+    words, in_span = tokenize_marked(reference)
+    hyp_words = WORD.findall(str(hypothesis).lower())
+    chars, char_flags = chars_with_flags(words, in_span)
+    return {
+        'word': score(words, in_span, hyp_words),
+        'char': score(chars, char_flags, list(' '.join(hyp_words))),
+    }
+
+
+def score_chunk(pairs):
+    """Top-level so worker processes can pickle it."""
+    return [score_segment(ref, hyp) for ref, hyp in pairs]
+
+
+def score_corpus(pairs, workers=None, chunk_size=CHUNK_SIZE):
+    chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+    if workers == 1 or len(chunks) <= 1:
+        return [res for chunk in chunks for res in score_chunk(chunk)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [res for results in executor.map(score_chunk, chunks) for res in results]
+
+
+def summarize(variant, results):
+    """Pool segment counts into corpus-level rates per level."""
+    rows = []
+    for level in ['word', 'char']:
+        total = dict.fromkeys(COUNT_FIELDS, 0)
+        for res in results:
+            for field in COUNT_FIELDS:
+                total[field] += res[level][field]
+
+        def rate(errors, n):
+            return round(100 * errors / n, 2) if n else 0.0
+
+        errors = total['Sub'] + total['Del'] + total['Ins']
+        rows.append({
+            'Variant': variant,
+            'Level': level,
+            'Segments': len(results),
+            'Ref_Tokens': total['Ref'],
+            'Sub': total['Sub'],
+            'Del': total['Del'],
+            'Ins': total['Ins'],
+            'Error_Rate_%': rate(errors, total['Ref']),
+            'In_Span_Rate_%': rate(total['Errors_In'], total['Ref_In']),
+            'Out_Of_Span_Rate_%': rate(total['Errors_Out'], total['Ref_Out']),
+            'Fluent_Ref_Rate_%': rate(total['Fluent_Errors'], total['Fluent_Ref']),
+        })
+    return rows
+
+
+# ------------------------------------------------------------
+# VARIANTS
+# ------------------------------------------------------------
+
+def load_variants(df, asr_dir=ASR_DIR):
+    """Variant name -> {ID: transcript}.
+
+    Every `<variant>.csv` in `asr_dir` with ID and Transcript columns is one
+    ASR system. Two reference points are always included: `verbatim` (the
+    marked transcript without markup) and `fluent` (EN_fluent).
+    """
+    variants = {
+        'verbatim': dict(zip(df['ID'], df['EN_disfluent'].str.replace('_', ' ', regex=False))),
+        'fluent': dict(zip(df['ID'], df['EN_fluent'])),
+    }
+    for path in sorted(glob.glob(os.path.join(asr_dir, '*.csv'))):
+        hyp = pd.read_csv(path)
+        variants[os.path.basename(path)[:-len('.csv')]] = dict(zip(hyp['ID'], hyp['Transcript'].fillna('')))
+    return variants
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--asr-dir', default=ASR_DIR,
+                        help='directory of <variant>.csv files with ID and Transcript columns')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    df = pd.read_csv(DATA_FILE)
+    references = dict(zip(df['ID'], df['EN_disfluent']))
+    variants = load_variants(df, args.asr_dir)
+
+    # One flat batch over every (variant, segment) so the pool stays busy
+    keys, pairs = [], []
+    for name, transcripts in variants.items():
+        for sample_id, hyp in transcripts.items():
+            if sample_id in references:
+                keys.append(name)
+                pairs.append((references[sample_id], hyp))
+
+    start = time.perf_counter()
+    results = score_corpus(pairs, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Scored {len(pairs)} segments from {len(variants)} variants in {elapsed:.2f}s\n")
+
+    by_variant = {}
+    for name, res in zip(keys, results):
+        by_variant.setdefault(name, []).append(res)
+
+    rows = []
+    for name in variants:
+        rows.extend(summarize(name, by_variant.get(name, [])))
+    table = pd.DataFrame(rows)
+    print(table.to_string(index=False))
+
+    table.to_csv(OUTPUT_FILE, index=False)
+    print(f"\n✓ Saved to {OUTPUT_FILE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+"""Shared loader for the pluggable backends of the inference, TTS and streaming scripts."""
+
+import importlib
+
+
+def load_backend(spec, registry, cache=None):
+    """Instantiate a backend by registry name or 'package.module:ClassName'.
+
+    With a `cache` dict the instance is kept per spec, so worker processes
+    build each backend once rather than once per batch.
+    """
+    if cache is not None and spec in cache:
+        return cache[spec]
+
+    if spec in registry:
+        backend_cls = registry[spec]
+    elif ':' in spec:
+        module_name, class_name = spec.split(':', 1)
+        backend_cls = getattr(importlib.import_module(module_name), class_name)
+    else:
+        raise ValueError(f"Unknown backend: {spec}")
+
+    backend = backend_cls()
+    if cache is not None:
+        cache[spec] = backend
+    return backend
@@ -0,0 +1,160 @@
+"""Sparse EN-to-target disfluency co-occurrence with PMI-ranked equivalents."""
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from token_index import normalize_token
+
+# Configuration
+DATA_FILE = 'data/uh-mazing.csv'
+OUTPUT_DIR = 'outputs/results'
+MIN_COOCCURRENCE = 2
+TOP_K = 5
+EXAMPLES = ['you know', 'uh', 'i mean', 'well']
+
+HAN_GAP = re.compile(r'(?<=[\u3400-\u9fff]) (?=[\u3400-\u9fff])')
+
+
+def span_phrases(text):
+    """Normalized disfluency phrases in a marked-up text.
+
+    Adjacent spans separated only by whitespace (`_you_ _know_`) are joined
+    into one phrase; punctuation-only spans (`_, _`) end a phrase.
+    """
+    if pd.isna(text):
+        return []
+
+    text = str(text)
+    phrases = []
+    current = []
+    prev_end = None
+
+    for match in re.finditer(r'_([^_]+)_', text):
+        token = normalize_token(match.group(1))
+        contiguous = prev_end is not None and not text[prev_end:match.start()].strip()
+        if current and (not token or not contiguous):
+            phrases.append(HAN_GAP.sub('', ' '.join(current)))
+            current = []
+        if token:
+            current.append(token)
+        prev_end = match.end()
+
+    if current:
+        phrases.append(HAN_GAP.sub('', ' '.join(current)))
+    return phrases
+
+
+def incidence_matrix(docs, vocab):
+    """Binary samples x vocabulary matrix; new phrases join `vocab` in first-seen order."""
+    rows, cols = [], []
+    for i, phrases in enumerate(docs):
+        for phrase in dict.fromkeys(phrases):
+            rows.append(i)
+            cols.append(vocab.setdefault(phrase, len(vocab)))
+
+    data = np.ones(len(rows), dtype=np.int32)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(docs), len(vocab)))
+
+
+def cooccurrence(en_docs, target_docs):
+    """Return (counts, pmi, npmi, en_vocab, target_vocab) as sparse matrices.
+
+    Counts are the number of samples in which an EN phrase and a target
+    phrase both occur, computed as A^T B over the sample incidence
+    matrices. Association scores are only evaluated on non-zero cells, and
+    all three matrices share one CSR layout (indptr and indices).
+    """
+    en_vocab, target_vocab = {}, {}
+    a = incidence_matrix(en_docs, en_vocab)
+    b = incidence_matrix(target_docs, target_vocab)
+    n_docs = len(en_docs)
+
+    counts = sparse.csr_matrix(a.T @ b)
+    counts.sort_indices()
+    en_freq = np.asarray(a.sum(axis=0)).ravel()
+    target_freq = np.asarray(b.sum(axis=0)).ravel()
+
+    rows = np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr))
+    joint = counts.data / n_docs
+    p_en = en_freq[rows] / n_docs
+    p_target = target_freq[counts.indices] / n_docs
+    pmi = np.log(joint / (p_en * p_target))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        npmi = np.where(joint < 1, pmi / -np.log(joint), 1.0)
+
+    layout = (counts.indices, counts.indptr)
+    pmi_m = sparse.csr_matrix((pmi, *layout), shape=counts.shape)
+    npmi_m = sparse.csr_matrix((npmi, *layout), shape=counts.shape)
+    return counts, pmi_m, npmi_m, en_vocab, target_vocab
+
+
+def ranked_equivalents(counts, npmi, pmi, en_vocab, target_vocab,
+                       min_count=MIN_COOCCURRENCE, top_k=TOP_K):
+    """Top target phrases per EN phrase, ranked by NPMI.
+
+    Rows are read straight from the CSR arrays; `npmi` and `pmi` share the
+    layout of `counts`, so one slice of each gives a row's cells.
+    """
+    en_names = np.empty(len(en_vocab), dtype=object)
+    en_names[list(en_vocab.values())] = list(en_vocab.keys())
+    target_names = np.empty(len(target_vocab), dtype=object)
+    target_names[list(target_vocab.values())] = list(target_vocab.keys())
+
+    rows = []
+    for i in range(counts.shape[0]):
+        start, end = counts.indptr[i], counts.indptr[i + 1]
+        cell_counts = counts.data[start:end]
+        keep = cell_counts >= min_count
+        if not keep.any():
+            continue
+
+        cols, cell_counts = counts.indices[start:end][keep], cell_counts[keep]
+        scores = npmi.data[start:end][keep]
+        pmis = pmi.data[start:end][keep]
+        order = np.lexsort((-cell_counts, -scores))[:top_k]
+        for rank, j in enumerate(order, start=1):
+            rows.append({
+                'EN_Token': en_names[i],
+                'Target_Token': target_names[cols[j]],
+                'Count': int(cell_counts[j]),
+                'PMI': round(float(pmis[j]), 4),
+                'NPMI': round(float(scores[j]), 4),
+                'Rank': rank,
+            })
+
+    return pd.DataFrame(rows, columns=['EN_Token', 'Target_Token', 'Count', 'PMI', 'NPMI', 'Rank'])
+
+
+def main():
+    print("Loading dataset...")
+    df = pd.read_csv(DATA_FILE)
+    print(f"Loaded {len(df)} samples\n")
+
+    en_docs = [span_phrases(text) for text in df['EN_disfluent']]
+    lang_cols = [col for col in df.columns if col.endswith('_disfluent') and col != 'EN_disfluent']
+
+    for col in lang_cols:
+        lang = col.replace('_disfluent', '')
+        target_docs = [span_phrases(text) for text in df[col]]
+
+        counts, pmi, npmi, en_vocab, target_vocab = cooccurrence(en_docs, target_docs)
+        table = ranked_equivalents(counts, npmi, pmi, en_vocab, target_vocab)
+
+        output_path = os.path.join(OUTPUT_DIR, f'cooccurrence_{lang}.csv')
+        table.to_csv(output_path, index=False)
+        print(f"{lang}: {counts.shape[0]} EN x {counts.shape[1]} {lang} phrases, "
+              f"{counts.nnz} non-zero cells -> {output_path}")
+
+        for example in EXAMPLES:
+            top = table[table['EN_Token'] == example].head(3)
+            if len(top):
+                pairs = ', '.join(f"{t} ({s:.2f})" for t, s in zip(top['Target_Token'], top['NPMI']))
+                print(f"  {example} -> {pairs}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""Copy-on-write patch layers for versions of the dataset."""
+
+import argparse
+import json
+import os
+import re
+import shutil
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import pandas as pd
+
+# Configuration
+DATA_FILE = 'data/uh-mazing.csv'
+VERSIONS_DIR = 'data/versions'
+BASE_NAME = 'base'
+
+
+def extract_underscored_tokens(text):
+    """Extract all tokens between underscores."""
+    if pd.isna(text):
+        return []
+    return re.findall(r'_([^_]+)_', str(text))
+
+
+def column_for(lang):
+    return f'{lang}_disfluent'
+
+
+class DatasetVersion:
+    """Lazy view of the base snapshot with a chain of patch sets applied."""
+
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+        self._cells = None
+
+    @property
+    def cells(self):
+        """Merged (ID, language) -> text patches, oldest ancestor first."""
+        if self._cells is None:
+            merged = {}
+            for layer in reversed(self.store.lineage(self.name)):
+                merged.update(self.store.patches(layer))
+            self._cells = merged
+        return self._cells
+
+    def get(self, sample_id, lang):
+        key = (sample_id, lang)
+        if key in self.cells:
+            return self.cells[key]
+        return self.store.base_cell(sample_id, lang)
+
+    def to_dataframe(self):
+        """Materialize the full table for this version."""
+        df = self.store.base.copy()
+        row_of = {sample_id: i for i, sample_id in enumerate(df['ID'])}
+        for (sample_id, lang), text in self.cells.items():
+            df.iat[row_of[sample_id], df.columns.get_loc(column_for(lang))] = text
+        return df
+
+
+class VersionStore:
+    """Base snapshot plus small JSON patch sets keyed by (ID, language)."""
+
+    def __init__(self, root=VERSIONS_DIR):
+        self.root = root
+        self._base = None
+        self._base_index = None
+        self._meta = {}
+
+    @property
+    def base_path(self):
+        return os.path.join(self.root, f'{BASE_NAME}.csv')
+
+    def init(self, data_file=DATA_FILE):
+        """Freeze the current dataset as the base snapshot (once)."""
+        os.makedirs(self.root, exist_ok=True)
+        if not os.path.exists(self.base_path):
+            shutil.copyfile(data_file, self.base_path)
+        return self.base_path
+
+    @property
+    def base(self):
+        if self._base is None:
+            self._base = pd.read_csv(self.base_path)
+            self._base_index = {sample_id: i for i, sample_id in enumerate(self._base['ID'])}
+        return self._base
+
+    def base_cell(self, sample_id, lang):
+        base = self.base
+        value = base.iat[self._base_index[sample_id], base.columns.get_loc(column_for(lang))]
+        return None if pd.isna(value) else value
+
+    def _version_path(self, name):
+        return os.path.join(self.root, f'{name}.json')
+
+    def _load(self, name):
+        if name not in self._meta:
+            with open(self._version_path(name), 'r', encoding='utf-8') as f:
+                self._meta[name] = json.load(f)
+        return self._meta[name]
+
+    def list_versions(self):
+        names = [f[:-5] for f in os.listdir(self.root) if f.endswith('.json')]
+        return sorted(names, key=lambda n: self._load(n)['created'])
+
+    def lineage(self, name):
+        """Version names from `name` back to (but excluding) the base."""
+        chain = []
+        while name and name != BASE_NAME:
+            chain.append(name)
+            name = self._load(name)['parent']
+        return chain
+
+    def patches(self, name):
+        return {(p['ID'], p['Language']): p['Text'] for p in self._load(name)['patches']}
+
+    def version(self, name=BASE_NAME):
+        return DatasetVersion(self, name)
+
+    def commit(self, name, patches, parent=BASE_NAME, note=''):
+        """Record a new version holding only the cells that differ from `parent`.
+
+        `patches` is an iterable of dicts with ID, Language and Text.
+        """
+        if os.path.exists(self._version_path(name)) or name == BASE_NAME:
+            raise ValueError(f"Version already exists: {name}")
+
+        parent_view = self.version(parent)
+        changed = []
+        for patch in patches:
+            if patch['Text'] != parent_view.get(patch['ID'], patch['Language']):
+                changed.append({'ID': patch['ID'], 'Language': patch['Language'],
+                                'Text': patch['Text']})
+
+        meta = {
+            'name': name,
+            'parent': parent,
+            'created': datetime.now(timezone.utc).isoformat(),
+            'note': note,
+            'patches': changed,
+        }
+        with open(self._version_path(name), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=1)
+        self._meta[name] = meta
+        return self.version(name)
+
+    def diff(self, old, new):
+        """Changed cells and per-language token count deltas between two versions.
+
+        Only cells patched somewhere in either lineage can differ, so the
+        base table is never scanned.
+        """
+        old_view = self.version(old)
+        new_view = self.version(new)
+        keys = set(old_view.cells) | set(new_view.cells)
+
+        changes = []
+        token_delta = defaultdict(int)
+        for sample_id, lang in sorted(keys):
+            before = old_view.get(sample_id, lang)
+            after = new_view.get(sample_id, lang)
+            if before == after:
+                continue
+            delta = len(extract_underscored_tokens(after)) - len(extract_underscored_tokens(before))
+            token_delta[lang] += delta
+            changes.append({
+                'ID': sample_id,
+                'Language': lang,
+                'Old': before,
+                'New': after,
+                'Token_Delta': delta,
+            })
+
+        return changes, dict(token_delta)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('init', help='freeze data/uh-mazing.csv as the base snapshot')
+    sub.add_parser('list', help='list versions')
+
+    p_commit = sub.add_parser('commit', help='add a version from a patch CSV (ID, Language, Text)')
+    p_commit.add_argument('name')
+    p_commit.add_argument('patch_file')
+    p_commit.add_argument('--parent', default=BASE_NAME)
+    p_commit.add_argument('--note', default='')
+
+    p_diff = sub.add_parser('diff', help='compare two versions')
+    p_diff.add_argument('old')
+    p_diff.add_argument('new')
+
+    p_export = sub.add_parser('export', help='materialize a version as CSV')
+    p_export.add_argument('name')
+    p_export.add_argument('output')
+    args = parser.parse_args()
+
+    store = VersionStore()
+
+    if args.command == 'init':
+        print(f"✓ Base snapshot: {store.init()}")
+
+    elif args.command == 'list':
+        for name in store.list_versions():
+            meta = store._load(name)
+            print(f"{name} (parent: {meta['parent']}, {len(meta['patches'])} cells) {meta['note']}")
+
+    elif args.command == 'commit':
+        patches = pd.read_csv(args.patch_file).to_dict('records')
+        version = store.commit(args.name, patches, args.parent, args.note)
+        print(f"✓ Created {args.name} with {len(store.patches(version.name))} changed cells")
+
+    elif args.command == 'diff':
+        changes, token_delta = store.diff(args.old, args.new)
+        print(f"{len(changes)} changed cells\n")
+        print("Token count change by language:")
+        for lang, delta in sorted(token_delta.items()):
+            print(f"  {lang}: {delta:+d}")
+        for change in changes:
+            print(f"\n[{change['ID']}] {change['Language']} ({change['Token_Delta']:+d} tokens)")
+            print(f"  - {change['Old']}")
+            print(f"  + {change['New']}")
+
+    elif args.command == 'export':
+        store.version(args.name).to_dataframe().to_csv(args.output, index=False)
+        print(f"✓ Saved {args.name} to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,111 +1,183 @@
 """Detect annotation errors in disfluency marking."""
 
-import pandas as pd
+import argparse
+import csv
+import gzip
 import re
 from collections import defaultdict
 
+from word_count import count_words
+
 # Configuration
 LONG_TOKEN_THRESHOLD = 50
+LONG_TOKEN_WORDS = 10
+DATA_FILE = 'data/uh-mazing.csv'
 OUTPUT_FILE = 'outputs/results/annotation_errors.csv'
+SUMMARY_FILE = 'outputs/results/annotation_errors_summary.csv'
+
+ERROR_FIELDS = ['Sample_ID', 'Language', 'Error_Type', 'Start', 'End', 'Token_Length']
+
+
+def is_missing(value):
+    """True for None, NaN and the empty cells the csv module yields."""
+    return value is None or value != value or value == ''
+
 
 def extract_underscored_tokens(text):
     """Extract all tokens between underscores."""
-    if pd.isna(text):
+    if is_missing(text):
         return []
     return re.findall(r'_([^_]+)_', str(text))
 
 
-def is_likely_error(token):
+def has_sentence_break(token):
+    """A sentence boundary well inside the span means it swallowed fluent text."""
+    return any(punct in token[:-5] for punct in ['. ', '! ', '? '])
+
+
+def is_likely_error(token, max_chars=LONG_TOKEN_THRESHOLD, max_words=LONG_TOKEN_WORDS):
     """Check if token is likely an annotation error."""
-    if len(token) > LONG_TOKEN_THRESHOLD:
+    if len(token) > max_chars:
         return True
 
-    if any(punct in token[:-5] for punct in ['. ', '! ', '? ']):
+    if has_sentence_break(token):
         return True
 
-    word_count = len(token.split())
-    if word_count > 10:
+    word_count = count_words(token)
+    if word_count > max_words:
         return True
 
     return False
 
 
 def analyze_sample(row):
-    """Analyze a sample for annotation errors."""
+    """Analyze a sample for annotation errors.
+
+    Errors carry (Start, End) offsets into the language's `*_disfluent`
+    cell rather than copies of the token and its context.
+    """
     errors = []
     sample_id = row['ID']
 
-    en_tokens = extract_underscored_tokens(row['EN_disfluent'])
-    en_token_lengths = [len(t) for t in en_tokens]
-
-    lang_cols = [col for col in row.index if col.endswith('_disfluent') and col != 'EN_disfluent']
-
-    for col in lang_cols:
-        if pd.isna(row[col]):
+    for col, text in row.items():
+        if not col.endswith('_disfluent') or col == 'EN_disfluent':
+            continue
+        if is_missing(text):
             continue
 
         lang = col.replace('_disfluent', '')
-        tokens = extract_underscored_tokens(row[col])
 
-        for token in tokens:
+        for match in re.finditer(r'_([^_]+)_', str(text)):
+            token = match.group(1)
             if is_likely_error(token):
                 errors.append({
                     'Sample_ID': sample_id,
                     'Language': lang,
                     'Error_Type': 'Long_Token',
+                    'Start': match.start(1),
+                    'End': match.end(1),
                     'Token_Length': len(token),
-                    'Token_Preview': token[:100] + '...' if len(token) > 100 else token,
-                    'Full_Token': token,
-                    'Context': row[col][:200] + '...' if len(row[col]) > 200 else row[col]
                 })
 
     return errors
 
 
-def main():
-    print("Loading dataset...")
-    df = pd.read_csv('data/uh-mazing.csv')
-    print(f"Loaded {len(df)} samples\n")
+def open_output(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
 
-    print("Detecting annotation errors...")
-    all_errors = []
 
-    for idx, row in df.iterrows():
-        errors = analyze_sample(row)
-        all_errors.extend(errors)
+class StreamingErrorWriter:
+    """Write error rows as they are detected and keep per-language totals."""
+
+    def __init__(self, path=OUTPUT_FILE):
+        self.path = path
+        self.f = open_output(path)
+        self.writer = csv.DictWriter(self.f, fieldnames=ERROR_FIELDS, lineterminator='\n')
+        self.writer.writeheader()
+        self.count = 0
+        self.by_lang = defaultdict(lambda: {'Errors': 0, 'Total_Length': 0, 'Max_Length': 0})
+
+    def write(self, error):
+        self.writer.writerow(error)
+        self.count += 1
+        stats = self.by_lang[error['Language']]
+        stats['Errors'] += 1
+        stats['Total_Length'] += error['Token_Length']
+        stats['Max_Length'] = max(stats['Max_Length'], error['Token_Length'])
+
+    def write_summary(self, path=SUMMARY_FILE):
+        """Per-language summary built from the same stream."""
+        with open_output(path) as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(['Language', 'Errors', 'Mean_Token_Length', 'Max_Token_Length'])
+            for lang, stats in sorted(self.by_lang.items(), key=lambda x: x[1]['Errors'], reverse=True):
+                mean_length = stats['Total_Length'] / stats['Errors']
+                writer.writerow([lang, stats['Errors'], f'{mean_length:.1f}', stats['Max_Length']])
+
+    def close(self):
+        self.f.close()
+
 
-    print(f"\nFound {len(all_errors)} potential annotation errors\n")
+def iter_rows(path=DATA_FILE):
+    """Stream dataset rows as dicts without loading the whole table."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        yield from csv.DictReader(f)
 
-    errors_by_lang = defaultdict(int)
-    for error in all_errors:
-        errors_by_lang[error['Language']] += 1
+
+def run(compress=False):
+    """Detect errors in the dataset and write the report and summary."""
+    suffix = '.gz' if compress else ''
+    output_file = OUTPUT_FILE + suffix
+    summary_file = SUMMARY_FILE + suffix
+
+    print("Detecting annotation errors...")
+    writer = StreamingErrorWriter(output_file)
+    examples = {}
+    n_samples = 0
+
+    for row in iter_rows():
+        n_samples += 1
+        for error in analyze_sample(row):
+            writer.write(error)
+            if error['Language'] not in examples:
+                text = row[f"{error['Language']}_disfluent"]
+                examples[error['Language']] = (error, text[error['Start']:error['End']])
+
+    writer.close()
+    print(f"Scanned {n_samples} samples")
+    print(f"\nFound {writer.count} potential annotation errors\n")
 
     print("Errors by language:")
-    for lang, count in sorted(errors_by_lang.items(), key=lambda x: x[1], reverse=True):
-        print(f"  {lang}: {count} errors")
+    for lang, stats in sorted(writer.by_lang.items(), key=lambda x: x[1]['Errors'], reverse=True):
+        print(f"  {lang}: {stats['Errors']} errors")
 
-    if all_errors:
-        errors_df = pd.DataFrame(all_errors)
-        errors_df.to_csv(OUTPUT_FILE, index=False)
-        print(f"\n✓ Saved detailed report to: {OUTPUT_FILE}")
+    if writer.count:
+        print(f"\n✓ Saved detailed report to: {output_file}")
 
-        summary_df = errors_df.drop(columns=['Full_Token', 'Context'])
-        summary_df.to_csv('outputs/results/annotation_errors_summary.csv', index=False)
-        print(f"✓ Saved summary to: outputs/results/annotation_errors_summary.csv")
+        writer.write_summary(summary_file)
+        print(f"✓ Saved summary to: {summary_file}")
 
         print("\n=== EXAMPLES ===\n")
         for lang in ['CS', 'AR', 'ES'][:3]:
-            lang_errors = errors_df[errors_df['Language'] == lang]
-            if len(lang_errors) > 0:
+            if lang in examples:
+                example, token = examples[lang]
                 print(f"{lang} example:")
-                example = lang_errors.iloc[0]
                 print(f"  Sample: {example['Sample_ID']}")
                 print(f"  Token length: {example['Token_Length']} chars")
-                print(f"  Preview: {example['Token_Preview']}")
+                print(f"  Preview: {token[:100] + '...' if len(token) > 100 else token}")
                 print()
     else:
         print("No errors detected!")
 
 
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--compress', action='store_true', help='write gzip-compressed reports')
+    args = parser.parse_args()
+    run(args.compress)
+
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
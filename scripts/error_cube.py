@@ -0,0 +1,244 @@
+"""Materialized span/error cube: System x Prompt x Language x Span_Type x Error_Type.
+
+Every marked span adds to one cell's `Spans` and `Chars` sums. Human
+annotations come from the dataset (System 'human', Prompt 'annotation');
+model outputs come from run_inference checkpoints, read from the last
+byte offset seen so a re-run only parses new lines (a rewritten
+checkpoint is detected and re-read in full). The cube is saved as
+integer-coded cells in a compressed .npz, and roll-ups are group-sums over
+those cells rather than rescans of segment-level data.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from detect_annotation_errors import (
+    DATA_FILE, LONG_TOKEN_THRESHOLD, LONG_TOKEN_WORDS, is_likely_error, is_missing, iter_rows,
+)
+from span_types import LEXICON_FILE, SpanClassifier, normalize
+from word_count import MAX_TABLE_WORD, TOKEN_TABLE
+
+# Configuration
+CUBE_FILE = 'outputs/results/error_cube.npz'
+CHECKPOINT_DIR = 'outputs/results/inference'
+DIMENSIONS = ['System', 'Prompt', 'Language', 'Span_Type', 'Error_Type']
+MEASURES = ['Spans', 'Chars']
+HUMAN = ('human', 'annotation')
+NO_ERROR = 'none'
+
+SPAN = re.compile(r'_([^_]+)_')
+
+
+def span_cells(text, lang, classifier):
+    """(span type, error type, length) for every marked span of one cell."""
+    if is_missing(text):
+        return []
+    text = str(text)
+
+    # classify() drops punctuation-only spans and lists the rest in order
+    labels = iter([label for _, label, raw in classifier.classify(text, lang) for _ in raw])
+    cells = []
+    for match in SPAN.finditer(text):
+        token = match.group(1)
+        span_type = next(labels) if normalize(token) else 'OTHER'
+        error_type = 'Long_Token' if lang != 'EN' and is_likely_error(token) else NO_ERROR
+        cells.append((span_type, error_type, len(token)))
+    return cells
+
+
+class ErrorCube:
+    """Sparse cube of summed measures keyed by dimension tuples."""
+
+    def __init__(self):
+        self.cells = {}
+        self.sources = {}
+
+    def add(self, key, spans=1, chars=0):
+        sums = self.cells.setdefault(key, [0, 0])
+        sums[0] += spans
+        sums[1] += chars
+
+    def add_text(self, system, prompt, lang, text, classifier):
+        for span_type, error_type, length in span_cells(text, lang, classifier):
+            self.add((system, prompt, lang, span_type, error_type), 1, length)
+
+    def drop_partition(self, system, prompt):
+        for key in [k for k in self.cells if k[:2] == (system, prompt)]:
+            del self.cells[key]
+
+    # ------------------------------------------------------------
+    # INCREMENTAL SOURCES
+    # ------------------------------------------------------------
+
+    def refresh_dataset(self, classifier, path=DATA_FILE):
+        """Rebuild the human partition only if the data, lexicon, Han dictionary or thresholds changed."""
+        digest = hashlib.sha256()
+        # The ZH token table feeds the Han word counts behind is_likely_error
+        for part in [path, LEXICON_FILE, TOKEN_TABLE]:
+            if os.path.exists(part):
+                with open(part, 'rb') as f:
+                    digest.update(f.read())
+        digest.update(f'{LONG_TOKEN_THRESHOLD}/{LONG_TOKEN_WORDS}/{MAX_TABLE_WORD}'.encode())
+        marker = digest.hexdigest()
+        if self.sources.get(path) == marker:
+            return False
+
+        self.drop_partition(*HUMAN)
+        for row in iter_rows(path):
+            for col, text in row.items():
+                if col.endswith('_disfluent'):
+                    self.add_text(*HUMAN, col.replace('_disfluent', ''), text, classifier)
+        self.sources[path] = marker
+        return True
+
+    def ingest_checkpoint(self, path, classifier):
+        """Add checkpoint records appended since the last ingest; returns how many.
+
+        The saved state is the file's inode, the consumed byte offset and a
+        hash of the consumed prefix. If any of them no longer matches (the
+        checkpoint was deleted and re-run, truncated or rewritten), the
+        partition is dropped and the file is read again from the start.
+        """
+        system, prompt = os.path.basename(path)[:-len('.jsonl')].split('__', 1)
+        state = self.sources.get(path)
+        inode = os.stat(path).st_ino
+
+        with open(path, 'rb') as f:
+            prefix = hashlib.sha256()
+            offset = 0
+            if isinstance(state, dict) and state['inode'] == inode and state['offset'] <= os.path.getsize(path):
+                prefix.update(f.read(state['offset']))
+                if prefix.hexdigest() == state['prefix']:
+                    offset = state['offset']
+            if offset == 0:
+                self.drop_partition(system, prompt)
+                prefix = hashlib.sha256()
+                f.seek(0)
+
+            added = 0
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # still being written
+                offset += len(line)
+                prefix.update(line)
+                if line.strip():
+                    record = json.loads(line)
+                    self.add_text(system, prompt, record['language'], record['output'], classifier)
+                    added += 1
+
+        self.sources[path] = {'inode': inode, 'offset': offset, 'prefix': prefix.hexdigest()}
+        return added
+
+    def drop_missing_checkpoints(self, checkpoints):
+        """Forget checkpoints that were ingested before but no longer exist; returns how many."""
+        gone = [p for p in self.sources if p.endswith('.jsonl') and p not in checkpoints]
+        for path in gone:
+            self.drop_partition(*os.path.basename(path)[:-len('.jsonl')].split('__', 1))
+            del self.sources[path]
+        return len(gone)
+
+    # ------------------------------------------------------------
+    # STORAGE
+    # ------------------------------------------------------------
+
+    def save(self, path=CUBE_FILE):
+        keys = sorted(self.cells)
+        vocabs, codes = [], []
+        for d in range(len(DIMENSIONS)):
+            values = sorted({k[d] for k in keys})
+            index = {v: i for i, v in enumerate(values)}
+            vocabs.append(np.array(values))
+            codes.append(np.array([index[k[d]] for k in keys], dtype=np.uint16))
+
+        np.savez_compressed(
+            path,
+            codes=np.stack(codes, axis=1) if keys else np.empty((0, len(DIMENSIONS)), np.uint16),
+            measures=np.array([self.cells[k] for k in keys], dtype=np.int64).reshape(-1, len(MEASURES)),
+            sources=np.array(json.dumps(self.sources)),
+            **{f'vocab_{d}': v for d, v in zip(DIMENSIONS, vocabs)},
+        )
+        return path
+
+    @classmethod
+    def load(cls, path=CUBE_FILE):
+        cube = cls()
+        with np.load(path) as data:
+            vocabs = [data[f'vocab_{d}'].tolist() for d in DIMENSIONS]
+            for row, sums in zip(data['codes'], data['measures']):
+                key = tuple(vocab[c] for vocab, c in zip(vocabs, row))
+                cube.cells[key] = [int(s) for s in sums]
+            cube.sources = json.loads(str(data['sources']))
+        return cube
+
+    # ------------------------------------------------------------
+    # QUERIES
+    # ------------------------------------------------------------
+
+    def frame(self):
+        rows = [key + tuple(sums) for key, sums in self.cells.items()]
+        return pd.DataFrame(rows, columns=DIMENSIONS + MEASURES)
+
+    def rollup(self, by, **filters):
+        """Measures summed over every dimension not in `by`, after exact-match filters.
+
+        A filter value may be a list to keep several members.
+        """
+        table = self.frame()
+        for dim, value in filters.items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            table = table[table[dim].isin(values)]
+        return table.groupby(list(by), as_index=False)[MEASURES].sum()
+
+
+def language_totals(cube, system=HUMAN[0], prompt=HUMAN[1]):
+    """Per-language Spans, Errors and error-span Chars for one system and prompt."""
+    spans = cube.rollup(['Language'], System=system, Prompt=prompt)
+    errors = cube.rollup(['Language', 'Error_Type'], System=system, Prompt=prompt)
+    errors = errors[errors['Error_Type'] != NO_ERROR].groupby('Language')[MEASURES].sum()
+
+    totals = spans.set_index('Language').rename(columns={'Chars': 'Span_Chars'})
+    totals['Errors'] = errors['Spans'].reindex(totals.index, fill_value=0)
+    totals['Error_Chars'] = errors['Chars'].reindex(totals.index, fill_value=0)
+    return totals.reset_index()
+
+
+def load_cube(path=CUBE_FILE, checkpoint_dir=CHECKPOINT_DIR):
+    """Load the saved cube, fold in new data and checkpoint lines, and save if anything changed."""
+    cube = ErrorCube.load(path) if os.path.exists(path) else ErrorCube()
+    classifier = SpanClassifier()
+
+    checkpoints = sorted(glob.glob(os.path.join(checkpoint_dir, '*__*.jsonl')))
+    changed = cube.refresh_dataset(classifier)
+    changed = cube.drop_missing_checkpoints(checkpoints) > 0 or changed
+    for checkpoint in checkpoints:
+        changed = cube.ingest_checkpoint(checkpoint, classifier) > 0 or changed
+    if changed or not os.path.exists(path):
+        cube.save(path)
+    return cube
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--by', nargs='+', default=['System', 'Prompt', 'Language'], choices=DIMENSIONS)
+    parser.add_argument('--rebuild', action='store_true', help='discard the saved cube first')
+    args = parser.parse_args()
+
+    if args.rebuild and os.path.exists(CUBE_FILE):
+        os.remove(CUBE_FILE)
+    cube = load_cube()
+
+    table = cube.rollup(args.by)
+    print(f"{len(cube.cells)} cells, {table['Spans'].sum()} spans\n")
+    print(table.to_string(index=False))
+    print(f"\n✓ Saved to {CUBE_FILE} ({os.path.getsize(CUBE_FILE)} bytes)")
+
+
+if __name__ == '__main__':
+    main()
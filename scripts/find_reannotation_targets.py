@@ -1,35 +1,79 @@
-"""Find all (ID, Language) pairs that need reannotation."""
+"""Find the (ID, Language) pairs that most need reannotation, within a budget."""
 
-import pandas as pd
+import argparse
+import csv
+import heapq
+import os
 import re
+import sys
 from collections import defaultdict
+from itertools import count
 
+from word_count import count_words
+
+FORMS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'forms')
+if FORMS_DIR not in sys.path:
+    sys.path.insert(0, FORMS_DIR)
+
+from effort import estimate_effort
+
+DATA_FILE = 'data/uh-mazing.csv'
 OUTPUT_FILE = 'outputs/results/reannotation_targets.csv'
+OUTPUT_FIELDS = ['ID', 'Language', 'Reason', 'Severity', 'EN_disfluent', 'Text']
+
+LONG_SPAN_WORDS = 10
+
+# Severity = weighted sum of: longest span / LONG_SPAN_WORDS (long spans only),
+# relative gap to the EN span count, and missing markup
+SEVERITY_WEIGHTS = {'long': 1.0, 'mismatch': 0.5, 'missing': 2.0}
+
+# Per-language budgets; None means unlimited
+BUDGET_ITEMS = None
+BUDGET_MINUTES = None
+
+
+def is_missing(value):
+    """True for None, NaN and the empty cells the csv module yields."""
+    return value is None or value != value or value == ''
+
+
+def severity(tokens, en_span_count, longest_words, missing):
+    """How much a flagged pair would gain from reannotation; higher is worse."""
+    long_part = longest_words / LONG_SPAN_WORDS if longest_words >= LONG_SPAN_WORDS else 0.0
+    mismatch = abs(len(tokens) - en_span_count) / max(en_span_count, 1)
+    return round(
+        SEVERITY_WEIGHTS['long'] * long_part
+        + SEVERITY_WEIGHTS['mismatch'] * mismatch
+        + SEVERITY_WEIGHTS['missing'] * missing,
+        3,
+    )
+
 
 def check_sample(row):
     """Check a row for annotation issues across all target languages."""
     results = []
     sample_id = row['ID']
+    en_span_count = len(re.findall(r'_([^_]+)_', str(row['EN_disfluent'])))
 
-    lang_cols = [col for col in row.index if col.endswith('_disfluent') and col != 'EN_disfluent']
-
-    for col in lang_cols:
-        if pd.isna(row[col]):
+    for col, value in row.items():
+        if not col.endswith('_disfluent') or col == 'EN_disfluent':
+            continue
+        if is_missing(value):
             continue
 
-        text = str(row[col])
+        text = str(value)
         lang = col.replace('_disfluent', '')
         reasons = []
 
         # Condition 1: any disfluency span has 10+ words
         tokens = re.findall(r'_([^_]+)_', text)
-        for token in tokens:
-            if len(token.split()) >= 10:
-                reasons.append('long_disfluency')
-                break
+        longest = max((count_words(token) for token in tokens), default=0)
+        if longest >= LONG_SPAN_WORDS:
+            reasons.append('long_disfluency')
 
         # Condition 2: no underscore markers at all
-        if '_' not in text:
+        missing = '_' not in text
+        if missing:
             reasons.append('missing_underscores')
 
         if reasons:
@@ -39,6 +83,7 @@ def check_sample(row):
                 'ID': sample_id,
                 'Language': lang,
                 'Reason': ';'.join(reasons),
+                'Severity': severity(tokens, en_span_count, longest, missing),
                 'EN_disfluent': row['EN_disfluent'],
                 'Text': clean_text
             })
@@ -46,25 +91,77 @@ def check_sample(row):
     return results
 
 
-def main():
-    print("Loading dataset...")
-    df = pd.read_csv('data/uh-mazing.csv')
-    print(f"Loaded {len(df)} samples\n")
+def item_minutes(flag):
+    """Estimated form minutes, from the same effort model the form scheduler packs with."""
+    return estimate_effort(flag['EN_disfluent'], flag['Text'])
+
+
+class BudgetedSelector:
+    """Keep the most severe flags per language under an item and/or minute budget.
 
-    all_flags = []
-    for _, row in df.iterrows():
-        all_flags.extend(check_sample(row))
+    Each language has a min-heap keyed on severity. A new flag is pushed and
+    the least severe flags are popped while the language is over budget, so
+    memory stays bounded by the budget and the candidates are never sorted.
+    On equal severity, earlier rows are kept. A language always keeps its
+    most severe flag, even when that one item alone exceeds the minute budget.
+    """
 
-    # Deduplicate by (ID, Language) — shouldn't happen given logic, but just in case
-    seen = set()
-    deduped = []
-    for flag in all_flags:
+    def __init__(self, max_items=BUDGET_ITEMS, max_minutes=BUDGET_MINUTES):
+        self.max_items = max_items
+        self.max_minutes = max_minutes
+        self.heaps = defaultdict(list)
+        self.minutes = defaultdict(float)
+        self.seen = set()
+        self.candidates = 0
+        self._order = count()
+
+    def over_budget(self, lang):
+        heap = self.heaps[lang]
+        if self.max_items is not None and len(heap) > self.max_items:
+            return True
+        return self.max_minutes is not None and len(heap) > 1 and self.minutes[lang] > self.max_minutes
+
+    def add(self, flag):
         key = (flag['ID'], flag['Language'])
-        if key not in seen:
-            seen.add(key)
-            deduped.append(flag)
+        if key in self.seen:
+            return
+        self.seen.add(key)
+        self.candidates += 1
+
+        lang = flag['Language']
+        minutes = item_minutes(flag) if self.max_minutes is not None else 0.0
+        heapq.heappush(self.heaps[lang], (flag['Severity'], -next(self._order), minutes, flag))
+        self.minutes[lang] += minutes
 
-    print(f"Found {len(deduped)} (ID, Language) pairs needing reannotation\n")
+        while self.heaps[lang] and self.over_budget(lang):
+            _, _, dropped, _ = heapq.heappop(self.heaps[lang])
+            self.minutes[lang] -= dropped
+
+    def selected(self):
+        """Kept flags, most severe first."""
+        kept = [entry for heap in self.heaps.values() for entry in heap]
+        kept.sort(key=lambda entry: (-entry[0], -entry[1]))
+        return [entry[3] for entry in kept]
+
+
+def run(max_items=BUDGET_ITEMS, max_minutes=BUDGET_MINUTES):
+    print("Loading dataset...")
+    selector = BudgetedSelector(max_items, max_minutes)
+    n_rows = 0
+    with open(DATA_FILE, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            n_rows += 1
+            for flag in check_sample(row):
+                selector.add(flag)
+    print(f"Loaded {n_rows} samples\n")
+
+    deduped = selector.selected()
+    print(f"Found {selector.candidates} (ID, Language) pairs needing reannotation")
+    if max_items is not None or max_minutes is not None:
+        limits = [f"{max_items} items" if max_items is not None else None,
+                  f"{max_minutes:g} min" if max_minutes is not None else None]
+        print(f"Selected {len(deduped)} within a budget of {' / '.join(l for l in limits if l)} per language")
+    print()
 
     # Breakdown by language
     lang_counts = defaultdict(int)
@@ -83,10 +180,22 @@ def main():
         print(f"  {reason}: {count}")
 
     # Save
-    out_df = pd.DataFrame(deduped)
-    out_df.to_csv(OUTPUT_FILE, index=False)
+    with open(OUTPUT_FILE, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(deduped)
     print(f"\n✓ Saved to {OUTPUT_FILE}")
 
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--budget-items', type=int, default=BUDGET_ITEMS,
+                        help='most severe items to keep per language')
+    parser.add_argument('--budget-minutes', type=float, default=BUDGET_MINUTES,
+                        help='estimated form minutes to spend per language')
+    args = parser.parse_args(argv)
+    run(args.budget_items, args.budget_minutes)
+
+
 if __name__ == '__main__':
     main()
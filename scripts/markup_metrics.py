@@ -0,0 +1,151 @@
+"""Disfluency marker density and markup compliance per sample and language."""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+# Configuration
+DATA_FILE = 'data/uh-mazing.csv'
+OUTPUT_FILE = 'outputs/results/markup_metrics.csv'
+SUMMARY_FILE = 'outputs/results/markup_metrics_summary.csv'
+OUTPUT_DIR = 'outputs/figures'
+
+
+def marker_counts(df):
+    """Character counts for every `*_disfluent` cell in one vectorized pass.
+
+    Returns (languages, counts) where each entry of `counts` is a
+    samples x languages integer array.
+    """
+    cols = [col for col in df.columns if col.endswith('_disfluent')]
+    languages = [col.replace('_disfluent', '') for col in cols]
+    text = np.ascontiguousarray(df[cols].fillna('').to_numpy(dtype=str))
+
+    # View the fixed-width unicode array as a (samples, languages, chars) code-point cube
+    codes = text.view(np.uint32).reshape(text.shape + (-1,))
+    underscores = (codes == ord('_')).sum(axis=-1)
+
+    # Underscores separate words too (`_you_ _know_`); a word starts wherever
+    # a word character follows a separator or the start of the cell
+    separator = (codes == 0) | (codes == ord('_')) | np.isin(codes, [ord(c) for c in ' \t\n\r'])
+    starts = ~separator
+    starts[..., 1:] &= separator[..., :-1]
+    words = starts.sum(axis=-1)
+
+    return languages, {
+        'Underscores': underscores,
+        'Spans': underscores // 2,
+        'Words': words,
+        'Chars': (codes != 0).sum(axis=-1),
+    }
+
+
+def sample_metrics(df):
+    """Tidy per-(ID, language) table of density, compliance and EN agreement."""
+    languages, counts = marker_counts(df)
+    n_samples, n_langs = counts['Spans'].shape
+    en_spans = counts['Spans'][:, languages.index('EN')][:, None]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        spans_per_word = np.where(counts['Words'] > 0, counts['Spans'] / counts['Words'], 0.0)
+        span_ratio = np.where(en_spans > 0, counts['Spans'] / en_spans, np.nan)
+
+    table = pd.DataFrame({
+        'ID': np.repeat(df['ID'].to_numpy(), n_langs),
+        'Language': np.tile(languages, n_samples),
+        'Underscores': counts['Underscores'].ravel(),
+        'Spans': counts['Spans'].ravel(),
+        'Words': counts['Words'].ravel(),
+        'Spans_Per_Word': spans_per_word.ravel().round(4),
+        'Has_Markup': (counts['Underscores'] > 0).ravel(),
+        # Every opening underscore needs a closing one
+        'Balanced': (counts['Underscores'] % 2 == 0).ravel(),
+        'EN_Spans': np.broadcast_to(en_spans, counts['Spans'].shape).ravel(),
+        'Span_Ratio_EN': span_ratio.ravel().round(4),
+        'Matches_EN_Spans': (counts['Spans'] == en_spans).ravel(),
+    })
+    return table
+
+
+def language_summary(table):
+    """Per-language aggregates of the per-sample table."""
+    grouped = table.groupby('Language', sort=False)
+    marked = table[table['Has_Markup']].groupby('Language', sort=False)
+
+    summary = pd.DataFrame({
+        'Samples': grouped.size(),
+        'Mean_Underscores': grouped['Underscores'].mean().round(2),
+        'Mean_Spans': grouped['Spans'].mean().round(2),
+        'Spans_Per_Word': (grouped['Spans'].sum() / grouped['Words'].sum()).round(4),
+        'Compliance_%': (grouped['Has_Markup'].mean() * 100).round(1),
+        'Balanced_%': (marked['Balanced'].mean() * 100).round(1),
+        'Span_Ratio_EN': (grouped['Spans'].sum() / grouped['EN_Spans'].sum()).round(3),
+        'Matches_EN_Spans_%': (grouped['Matches_EN_Spans'].mean() * 100).round(1),
+    })
+    summary['Balanced_%'] = summary['Balanced_%'].fillna(0.0)
+    return summary.reset_index().sort_values('Mean_Underscores', ascending=False)
+
+
+def plot_bars(languages, values, cmap, title, ylabel, label_fmt, output_path):
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    max_value = max(values) if max(values) > 0 else 1
+    bar_colors = [cmap(v / max_value) for v in values]
+
+    bars = ax.bar(languages, values, color=bar_colors, edgecolor='black', linewidth=1)
+    for bar, value in zip(bars, values):
+        ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + max_value * 0.01,
+                label_fmt.format(value), ha='center', va='bottom', fontweight='bold', fontsize=11)
+
+    ax.set_xlabel('Language Code', fontweight='bold', fontsize=12)
+    ax.set_ylabel(ylabel, fontweight='bold', fontsize=12)
+    ax.set_title(title, fontweight='bold', fontsize=14, pad=15)
+    ax.grid(axis='y', alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    print(f"Saved: {output_path}")
+    plt.close()
+
+
+def create_figures(summary, output_dir=OUTPUT_DIR):
+    from matplotlib.colors import LinearSegmentedColormap
+
+    density = summary.sort_values('Mean_Underscores', ascending=False)
+    plot_bars(
+        density['Language'].tolist(), density['Mean_Underscores'].tolist(),
+        LinearSegmentedColormap.from_list('density', ['#d6e6f2', '#5dade2', '#3498db', '#2471a3', '#1a5490'], N=100),
+        'Average Number of Underscore-Marked Disfluencies per Sample by Language',
+        'Mean Underscores per Sample', '{:.1f}',
+        os.path.join(output_dir, 'underscore_density_by_language.png'),
+    )
+
+    compliance = summary.sort_values('Compliance_%', ascending=False)
+    plot_bars(
+        compliance['Language'].tolist(), compliance['Compliance_%'].tolist(),
+        LinearSegmentedColormap.from_list('compliance', ['#e74c3c', '#f39c12', '#f1c40f', '#2ecc71'], N=100),
+        'Percentage of Samples with Underscore-Marked Disfluencies per Language',
+        'Compliance (%)', '{:.1f}%',
+        os.path.join(output_dir, 'compliance_by_language.png'),
+    )
+
+
+def main():
+    df = pd.read_csv(DATA_FILE)
+    table = sample_metrics(df)
+    summary = language_summary(table)
+
+    print(summary.to_string(index=False))
+
+    table.to_csv(OUTPUT_FILE, index=False)
+    summary.to_csv(SUMMARY_FILE, index=False)
+    print(f"\n✓ Saved per-sample metrics to {OUTPUT_FILE}")
+    print(f"✓ Saved summary to {SUMMARY_FILE}\n")
+
+    create_figures(summary)
+
+
+if __name__ == '__main__':
+    main()
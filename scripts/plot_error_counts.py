@@ -1,33 +1,15 @@
 """Bar chart of annotation errors by language."""
 
-import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
-import re
 
-def extract_underscored_tokens(text):
-    """Extract all tokens between underscores."""
-    if pd.isna(text):
-        return []
-    return re.findall(r'_([^_]+)_', str(text))
+from error_cube import language_totals, load_cube
 
 
 def main():
-    errors_df = pd.read_csv('outputs/results/annotation_errors.csv')
-    df = pd.read_csv('data/uh-mazing.csv')
-
-    disfluent_cols = [col for col in df.columns if col.endswith('_disfluent')]
-    total_tokens = {}
-    for col in disfluent_cols:
-        lang = col.replace('_disfluent', '')
-        all_tokens = []
-        for text in df[col].dropna():
-            tokens = extract_underscored_tokens(text)
-            all_tokens.extend(tokens)
-        total_tokens[lang] = len(all_tokens)
-
-    error_counts = errors_df['Language'].value_counts().to_dict()
-    error_counts['EN'] = 0
+    totals = language_totals(load_cube()).set_index('Language')
+    total_tokens = totals['Spans'].to_dict()
+    error_counts = totals['Errors'].to_dict()
 
     languages = sorted(error_counts.keys())
     errors = [error_counts.get(lang, 0) for lang in languages]
@@ -0,0 +1,268 @@
+"""Length-bucketed batched inference runner for translation backends."""
+
+import argparse
+import json
+import math
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from backends import load_backend
+from translation_cache import TranslationCache
+
+# Configuration
+DATA_FILE = 'data/uh-mazing.csv'
+CHECKPOINT_DIR = 'outputs/results/inference'
+TARGET_LANGUAGES = ['AR', 'CS', 'DE', 'ES', 'FR', 'HI', 'IT', 'ZH']
+MAX_BATCH_SIZE = 16
+# Padded cost budget per batch: batch size x longest item, in chars or seconds
+BATCH_BUDGET = {'chars': 4000, 'duration': 240.0}
+
+LANGUAGE_NAMES = {
+    'AR': 'Arabic',
+    'CS': 'Czech',
+    'DE': 'German',
+    'ES': 'Spanish',
+    'FR': 'French',
+    'HI': 'Hindi',
+    'IT': 'Italian',
+    'ZH': 'Mandarin',
+}
+
+PROMPTS = {
+    'standard': 'Translate the following English text into {language}:\n{text}',
+    'disfluency_aware': (
+        'Translate the following English text into {language}. Keep every '
+        'disfluency (filled pauses, repetitions, self-repairs) in the '
+        'translation:\n{text}'
+    ),
+}
+
+
+# ------------------------------------------------------------
+# BACKENDS
+# ------------------------------------------------------------
+
+class EchoBackend:
+    """Local dummy backend that returns the source text unchanged."""
+
+    name = 'echo'
+
+    def translate_batch(self, texts, target_language, prompt_template):
+        return list(texts)
+
+
+BACKENDS = {
+    'echo': EchoBackend,
+}
+
+_backend_instances = {}
+
+
+# ------------------------------------------------------------
+# SEGMENTS AND BATCHING
+# ------------------------------------------------------------
+
+def source_text(text):
+    """Strip underscore markup so models see the plain disfluent transcript."""
+    return re.sub(r'\s+', ' ', str(text).replace('_', '')).strip()
+
+
+def load_subset(path):
+    """(ID, language) pairs listed in a select_eval_subset.py manifest."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return {tuple(item) for item in json.load(f)['items']}
+
+
+def load_segments(df, languages, prompt, length_key='chars', subset=None):
+    """Build one segment per (ID, target language), optionally only those in `subset`."""
+    segments = []
+    for _, row in df.iterrows():
+        text = source_text(row['EN_disfluent'])
+
+        if length_key == 'duration':
+            duration = row['end_time'] - row['start_time']
+            length = 0.0 if pd.isna(duration) else float(duration)
+        else:
+            length = len(text)
+
+        for lang in languages:
+            if subset is not None and (row['ID'], lang) not in subset:
+                continue
+            segments.append({
+                'ID': row['ID'],
+                'language': lang,
+                'prompt': prompt,
+                'text': text,
+                'length': length,
+            })
+    return segments
+
+
+def make_batches(segments, max_batch_size=MAX_BATCH_SIZE, budget=BATCH_BUDGET['chars']):
+    """Sort by length and group into dynamic batches of one language each.
+
+    A batch grows until it hits `max_batch_size` items or its padded cost
+    (items x longest item) would exceed `budget`.
+    """
+    by_language = {}
+    for seg in segments:
+        by_language.setdefault(seg['language'], []).append(seg)
+
+    batches = []
+    for lang in sorted(by_language):
+        current = []
+        for seg in sorted(by_language[lang], key=lambda s: s['length']):
+            padded_cost = (len(current) + 1) * seg['length']
+            if current and (len(current) >= max_batch_size or padded_cost > budget):
+                batches.append(current)
+                current = []
+            current.append(seg)
+        if current:
+            batches.append(current)
+
+    return batches
+
+
+def run_batch(backend_spec, batch):
+    """Translate one batch; top-level so process pools can pickle it."""
+    backend = load_backend(backend_spec, BACKENDS, _backend_instances)
+    lang = batch[0]['language']
+    template = PROMPTS[batch[0]['prompt']]
+
+    outputs = backend.translate_batch([s['text'] for s in batch], LANGUAGE_NAMES[lang], template)
+    return [dict(seg, output=out) for seg, out in zip(batch, outputs)]
+
+
+# ------------------------------------------------------------
+# CHECKPOINTING
+# ------------------------------------------------------------
+
+def checkpoint_path(backend_spec, prompt):
+    safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', backend_spec)
+    return os.path.join(CHECKPOINT_DIR, f'{safe_name}__{prompt}.jsonl')
+
+
+def load_checkpoint(path):
+    """Return the set of (ID, language) pairs already completed."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                done.add((record['ID'], record['language']))
+    return done
+
+
+def append_checkpoint(f, results):
+    for res in results:
+        record = {
+            'ID': res['ID'],
+            'language': res['language'],
+            'prompt': res['prompt'],
+            'output': res['output'],
+        }
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    f.flush()
+
+
+# ------------------------------------------------------------
+# RUNNER
+# ------------------------------------------------------------
+
+def run(backend_spec, prompt='standard', languages=TARGET_LANGUAGES, length_key='chars',
+        max_batch_size=MAX_BATCH_SIZE, budget=None, workers=4, pool='thread',
+        use_cache=True, subset_path=None):
+    """Run every pending (ID, language) segment through a backend.
+
+    With `subset_path`, only the segments in that manifest are run; they
+    share the checkpoint with full runs, so a later full run resumes.
+    """
+    df = pd.read_csv(DATA_FILE)
+    subset = load_subset(subset_path) if subset_path else None
+    segments = load_segments(df, languages, prompt, length_key, subset)
+
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    path = checkpoint_path(backend_spec, prompt)
+    done = load_checkpoint(path)
+    pending = [s for s in segments if (s['ID'], s['language']) not in done]
+    print(f"{len(segments)} segments, {len(done)} already checkpointed, {len(pending)} pending")
+
+    cache = TranslationCache() if use_cache else None
+    start = time.perf_counter()
+    completed = 0
+
+    with open(path, 'a', encoding='utf-8') as ckpt:
+        if cache is not None:
+            to_run = []
+            cached = []
+            for seg in pending:
+                output = cache.get(backend_spec, PROMPTS[prompt], seg['text'], seg['language'])
+                if output is None:
+                    to_run.append(seg)
+                else:
+                    cached.append(dict(seg, output=output))
+            append_checkpoint(ckpt, cached)
+            completed += len(cached)
+            pending = to_run
+
+        if budget is None:
+            budget = BATCH_BUDGET[length_key]
+        batches = make_batches(pending, max_batch_size, budget)
+        print(f"Dispatching {len(batches)} batches to {workers} {pool} workers...")
+
+        executor_cls = ProcessPoolExecutor if pool == 'process' else ThreadPoolExecutor
+        with executor_cls(max_workers=workers) as executor:
+            futures = [executor.submit(run_batch, backend_spec, batch) for batch in batches]
+            for future in as_completed(futures):
+                results = future.result()
+                if cache is not None:
+                    for res in results:
+                        cache.put(backend_spec, PROMPTS[prompt], res['text'],
+                                  res['language'], res['output'])
+                append_checkpoint(ckpt, results)
+                completed += len(results)
+
+    elapsed = time.perf_counter() - start
+    rate = completed / elapsed if elapsed > 0 else math.inf
+    print(f"\n✓ {completed} segments in {elapsed:.2f}s ({rate:.1f} segments/s)")
+    print(f"✓ Results: {path}")
+
+    if cache is not None:
+        stats = cache.stats()
+        print(f"✓ Cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate'] * 100:.1f}% hit rate)")
+        cache.close()
+
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--backend', default='echo',
+                        help="registry name or 'package.module:ClassName'")
+    parser.add_argument('--prompt', default='standard', choices=sorted(PROMPTS))
+    parser.add_argument('--languages', nargs='+', default=TARGET_LANGUAGES)
+    parser.add_argument('--length-key', default='chars', choices=sorted(BATCH_BUDGET))
+    parser.add_argument('--batch-size', type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument('--budget', type=float, default=None,
+                        help='padded cost budget per batch (default depends on --length-key)')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--pool', default='thread', choices=['thread', 'process'])
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--subset', help='manifest from select_eval_subset.py; run only its segments')
+    args = parser.parse_args()
+
+    run(args.backend, args.prompt, args.languages, args.length_key, args.batch_size,
+        args.budget, args.workers, args.pool, not args.no_cache, args.subset)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,271 @@
+"""Stratified fast-proxy evaluation subset of (ID, language) segments."""
+
+import argparse
+import glob
+import json
+import os
+import re
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from run_inference import CHECKPOINT_DIR, TARGET_LANGUAGES, source_text
+from span_types import SpanClassifier
+
+# Configuration
+DATA_FILE = 'data/uh-mazing.csv'
+MANIFEST_FILE = 'outputs/results/eval_subset.json'
+CORRELATION_FILE = 'outputs/results/eval_subset_correlation.csv'
+SUBSET_FRACTION = 0.1
+DENSITY_BINS = ['low', 'mid', 'high']
+RANDOM_TRIALS = 200
+SEED = 13
+
+TYPE_PRIORITY = ['OTHER', 'INTJ', 'PRN', 'EDITED']
+
+
+def dominant_type(spans):
+    """Most frequent span type of a cell's classified spans, or NONE without spans."""
+    counts = Counter(label for _, label, _ in spans)
+    if not counts:
+        return 'NONE'
+    # Ties break toward the rarer, more informative type; OTHER only as a last resort
+    return max(TYPE_PRIORITY, key=lambda t: (t != 'OTHER' and counts[t] > 0, counts[t], TYPE_PRIORITY.index(t)))
+
+
+def marked_density(text):
+    """Share of non-space characters that sit inside disfluency spans."""
+    text = '' if pd.isna(text) else str(text)
+    marked = sum(len(re.sub(r'\s', '', span)) for span in re.findall(r'_([^_]+)_', text))
+    total = len(re.sub(r'[\s_]', '', text))
+    return marked / total if total else 0.0
+
+
+def segment_features(df, languages=TARGET_LANGUAGES):
+    """One row per (ID, language) with its density bin, type and stratum."""
+    classifier = SpanClassifier()
+    frames = []
+    for lang in languages:
+        types = df[f'{lang}_disfluent'].map(lambda text: dominant_type(classifier.classify(text, lang)))
+        density = df[f'{lang}_disfluent'].map(marked_density)
+        # Tertiles within each language; rank first so ties do not collapse bins
+        bins = pd.qcut(density.rank(method='first'), len(DENSITY_BINS), labels=DENSITY_BINS)
+        frames.append(pd.DataFrame({
+            'ID': df['ID'],
+            'Language': lang,
+            'Density': density.round(4),
+            'Density_Bin': bins.astype(str),
+            'Type': types,
+        }))
+
+    features = pd.concat(frames, ignore_index=True)
+    features['Stratum'] = features['Language'] + '/' + features['Density_Bin'] + '/' + features['Type']
+    return features
+
+
+def allocate(stratum_sizes, total):
+    """Largest-remainder allocation of `total` picks.
+
+    Every stratum gets at least one pick when the budget allows it; the
+    picks those minimums add beyond `total` are taken back from the strata
+    with the smallest remainders, so the picks always sum to `total`.
+    """
+    sizes = np.asarray(stratum_sizes, dtype=float)
+    quotas = sizes / sizes.sum() * total
+    floor = 1 if total >= len(sizes) else 0
+    picks = np.minimum(np.maximum(np.floor(quotas), floor), sizes).astype(int)
+
+    remainder = quotas - np.floor(quotas)
+    for i in np.argsort(-remainder, kind='stable'):
+        if picks.sum() >= total:
+            break
+        if picks[i] < sizes[i]:
+            picks[i] += 1
+    while picks.sum() > total:
+        for i in np.argsort(remainder, kind='stable'):
+            if picks.sum() <= total:
+                break
+            if picks[i] > floor:
+                picks[i] -= 1
+    return picks
+
+
+def spread_positions(n, k, rng):
+    """k distinct positions in range(n): one random position per equal-width bin."""
+    edges = np.ceil(np.linspace(0, n, k + 1)).astype(int)
+    return np.array([rng.integers(lo, hi) for lo, hi in zip(edges[:-1], edges[1:])], dtype=int)
+
+
+def select_subset(features, fraction=SUBSET_FRACTION, seed=SEED):
+    """Stratified sample of segments; each stratum keeps its share of the grid."""
+    rng = np.random.default_rng(seed)
+    strata = features.groupby('Stratum', sort=True)
+    names = list(strata.groups)
+    total = max(1, round(len(features) * fraction))
+    picks = allocate([len(strata.get_group(name)) for name in names], total)
+
+    chosen = []
+    for name, k in zip(names, picks):
+        group = strata.get_group(name).sort_values('Density')
+        # Spread picks over the density range within the stratum
+        chosen.append(group.iloc[spread_positions(len(group), k, rng)])
+
+    subset = pd.concat(chosen)
+    return subset.sort_values(['Language', 'ID']).reset_index(drop=True)
+
+
+def save_manifest(subset, features, path=MANIFEST_FILE, seed=SEED):
+    manifest = {
+        'seed': seed,
+        'segments': len(subset),
+        'full_segments': len(features),
+        'strata': subset['Stratum'].value_counts().sort_index().to_dict(),
+        'items': subset[['ID', 'Language']].values.tolist(),
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, ensure_ascii=False)
+        f.write('\n')
+
+
+# ------------------------------------------------------------
+# PAST RESULTS
+# ------------------------------------------------------------
+
+def chrf(hypothesis, reference, max_n=6, beta=2.0):
+    """Character n-gram F-score (whitespace removed), in 0-100."""
+    hyp = re.sub(r'\s+', '', str(hypothesis))
+    ref = re.sub(r'\s+', '', str(reference))
+    precisions, recalls = [], []
+    for n in range(1, max_n + 1):
+        hyp_ngrams = Counter(hyp[i:i + n] for i in range(len(hyp) - n + 1))
+        ref_ngrams = Counter(ref[i:i + n] for i in range(len(ref) - n + 1))
+        if not hyp_ngrams or not ref_ngrams:
+            continue
+        overlap = sum((hyp_ngrams & ref_ngrams).values())
+        precisions.append(overlap / sum(hyp_ngrams.values()))
+        recalls.append(overlap / sum(ref_ngrams.values()))
+
+    if not precisions:
+        return 0.0
+    p, r = np.mean(precisions), np.mean(recalls)
+    if p + r == 0:
+        return 0.0
+    return float(100 * (1 + beta ** 2) * p * r / (beta ** 2 * p + r))
+
+
+def checkpoint_scores(df, checkpoint_dir=CHECKPOINT_DIR):
+    """Per-segment chrF of every inference checkpoint against the human translations."""
+    references = {}
+    for lang in TARGET_LANGUAGES:
+        for sample_id, text in zip(df['ID'], df[f'{lang}_disfluent']):
+            references[(sample_id, lang)] = source_text(text)
+
+    rows = []
+    for path in sorted(glob.glob(os.path.join(checkpoint_dir, '*.jsonl'))):
+        system = os.path.basename(path)[:-len('.jsonl')]
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                key = (record['ID'], record['language'])
+                if key in references:
+                    rows.append({
+                        'System': system,
+                        'ID': key[0],
+                        'Language': key[1],
+                        'Score': chrf(record['output'], references[key]),
+                    })
+
+    # Later checkpoint lines win when a segment was rerun
+    scores = pd.DataFrame(rows, columns=['System', 'ID', 'Language', 'Score'])
+    return scores.drop_duplicates(['System', 'ID', 'Language'], keep='last')
+
+
+def cell_means(scores, pairs=None):
+    """Mean score per (system, language), optionally restricted to `pairs`."""
+    if pairs is not None:
+        keys = pd.MultiIndex.from_frame(scores[['ID', 'Language']])
+        scores = scores[keys.isin(list(pairs))]
+    return scores.groupby(['System', 'Language'])['Score'].mean()
+
+
+def subset_correlation(scores, pairs, features, trials=RANDOM_TRIALS, seed=SEED):
+    """Pearson/Spearman between full and subset (system, language) means.
+
+    The same statistic for random subsets of equal size is reported as a
+    baseline for how much the stratification buys.
+    """
+    full = cell_means(scores)
+    rows = []
+
+    def correlate(name, subset_means):
+        joined = pd.concat([full.rename('Full'), subset_means.rename('Subset')], axis=1).dropna()
+        rows.append({
+            'Subset': name,
+            'Cells': len(joined),
+            'Pearson': round(joined['Full'].corr(joined['Subset']), 4),
+            'Spearman': round(joined['Full'].corr(joined['Subset'], method='spearman'), 4),
+            'Mean_Abs_Diff': round((joined['Full'] - joined['Subset']).abs().mean(), 4),
+        })
+
+    correlate('stratified', cell_means(scores, pairs))
+
+    rng = np.random.default_rng(seed)
+    all_pairs = list(zip(features['ID'], features['Language']))
+    random_rows = []
+    for _ in range(trials):
+        sample = rng.choice(len(all_pairs), size=len(pairs), replace=False)
+        correlate('random', cell_means(scores, {all_pairs[i] for i in sample}))
+        random_rows.append(rows.pop())
+
+    if random_rows:
+        baseline = pd.DataFrame(random_rows)
+        rows.append({
+            'Subset': f'random (mean of {trials})',
+            'Cells': int(baseline['Cells'].iloc[0]),
+            'Pearson': round(baseline['Pearson'].mean(), 4),
+            'Spearman': round(baseline['Spearman'].mean(), 4),
+            'Mean_Abs_Diff': round(baseline['Mean_Abs_Diff'].mean(), 4),
+        })
+
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--fraction', type=float, default=SUBSET_FRACTION)
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--output', default=MANIFEST_FILE)
+    parser.add_argument('--scores', help="past results CSV with System, ID, Language, Score columns "
+                                         f"(default: chrF of checkpoints in {CHECKPOINT_DIR})")
+    args = parser.parse_args()
+
+    df = pd.read_csv(DATA_FILE)
+    features = segment_features(df)
+    subset = select_subset(features, args.fraction, args.seed)
+    save_manifest(subset, features, args.output, args.seed)
+
+    print(f"Selected {len(subset)} of {len(features)} segments "
+          f"({len(features) / len(subset):.1f}x fewer) across {subset['Stratum'].nunique()} strata")
+    print(f"\nBy language: {subset['Language'].value_counts().sort_index().to_dict()}")
+    print(f"By type:     {subset['Type'].value_counts().to_dict()}")
+    print(f"By density:  {subset['Density_Bin'].value_counts().to_dict()}")
+    print(f"\n✓ Saved manifest to {args.output}")
+
+    scores = pd.read_csv(args.scores) if args.scores else checkpoint_scores(df)
+    if scores.empty:
+        print(f"\nNo past results found; run run_inference.py or pass --scores to measure correlation")
+        return
+
+    pairs = set(zip(subset['ID'], subset['Language']))
+    table = subset_correlation(scores, pairs, features)
+    print(f"\nSubset vs full-set means over {scores['System'].nunique()} systems:")
+    print(table.to_string(index=False))
+    table.to_csv(CORRELATION_FILE, index=False)
+    print(f"\n✓ Saved to {CORRELATION_FILE}")
+
+
+if __name__ == '__main__':
+    main()
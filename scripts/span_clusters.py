@@ -0,0 +1,217 @@
+"""Cluster near-duplicate disfluency span strings with MinHash and LSH banding.
+
+Spans are first collapsed on a normalized key (case, surrounding
+whitespace and punctuation), then keys are grouped when the MinHash
+estimate of their character n-gram Jaccard similarity clears a
+threshold. LSH banding keeps candidate generation sub-quadratic; each
+candidate pair is then checked exactly before it is merged.
+"""
+
+import argparse
+import csv
+import os
+import re
+import time
+import zlib
+from collections import Counter
+
+import numpy as np
+
+from span_types import normalize
+
+# Configuration
+RESULTS_DIR = 'outputs/results'
+NGRAM = 2
+NUM_PERM = 64
+BANDS = 16
+SIMILARITY = 0.6
+# Exact check on candidate pairs: same word count, similar length and n-grams
+VERIFY_SIMILARITY = 0.8
+MIN_LENGTH_RATIO = 0.8
+BATCH_SIZE = 4096
+SEED = 13
+
+# Largest prime below 2**32: a * x + b with 32-bit a, x stays inside uint64
+PRIME = 4294967291
+
+
+def skeleton(key):
+    """Key with elongations collapsed, so `umm` and `uhhh` compare as `um` and `uh`."""
+    return re.sub(r'(.)\1+', r'\1', key)
+
+
+def ngrams(key, n=NGRAM):
+    padded = f' {skeleton(key)} '
+    return {padded[i:i + n] for i in range(max(1, len(padded) - n + 1))}
+
+
+def shingles(key, n=NGRAM):
+    """Stable 32-bit ids (CRC32) of the key's distinct character n-grams."""
+    return sorted(zlib.crc32(g.encode('utf-8')) for g in ngrams(key, n))
+
+
+def same_variant(a, b, similarity=VERIFY_SIMILARITY, min_ratio=MIN_LENGTH_RATIO):
+    """Exact check for an LSH candidate pair.
+
+    Keys must have the same number of words, comparable lengths and an
+    exact n-gram Jaccard of at least `similarity`, which keeps apart
+    were/where, uh/uh-huh and myslím/já myslím.
+    """
+    sa, sb = skeleton(a), skeleton(b)
+    if len(sa.split()) != len(sb.split()):
+        return False
+    if min(len(sa), len(sb)) < min_ratio * max(len(sa), len(sb)):
+        return False
+    ga, gb = ngrams(a), ngrams(b)
+    return len(ga & gb) >= similarity * len(ga | gb)
+
+
+def minhash_signatures(keys, num_perm=NUM_PERM, batch_size=BATCH_SIZE, seed=SEED):
+    """(len(keys), num_perm) MinHash matrix, computed in batches of keys.
+
+    Each batch concatenates every key's shingles, applies all hash
+    permutations at once and reduces per key with np.minimum.reduceat.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, PRIME, size=(num_perm, 1), dtype=np.uint64)
+    b = rng.integers(0, PRIME, size=(num_perm, 1), dtype=np.uint64)
+
+    signatures = np.empty((len(keys), num_perm), dtype=np.uint64)
+    for start in range(0, len(keys), batch_size):
+        batch = [shingles(k) for k in keys[start:start + batch_size]]
+        lengths = np.array([len(s) for s in batch])
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        values = np.fromiter((h for s in batch for h in s), dtype=np.uint64, count=int(lengths.sum()))
+
+        hashed = (a * values + b) % np.uint64(PRIME)
+        signatures[start:start + len(batch)] = np.minimum.reduceat(hashed, offsets, axis=1).T
+    return signatures
+
+
+class UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, x, y):
+        rx, ry = self.find(x), self.find(y)
+        if rx != ry:
+            self.parent[max(rx, ry)] = min(rx, ry)
+
+
+def lsh_groups(signatures, bands=BANDS, similarity=SIMILARITY, accept=None):
+    """Union keys sharing any band whose full signatures agree on >= `similarity`.
+
+    Every pair inside a bucket is a candidate (buckets are small), so the
+    result does not depend on which member a bucket happens to list first.
+    Pairs already in one cluster are skipped; `accept(i, j)` can veto a
+    candidate pair before it is merged.
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    uf = UnionFind(n)
+
+    for band in range(bands):
+        chunk = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        keys = chunk.view(np.dtype((np.void, chunk.dtype.itemsize * rows))).ravel()
+        _, inverse, sizes = np.unique(keys, return_inverse=True, return_counts=True)
+        inverse = inverse.ravel()
+
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.cumsum(sizes)[:-1]
+        for bucket in np.split(order, bounds):
+            if len(bucket) < 2:
+                continue
+            agree = (signatures[bucket][:, None, :] == signatures[bucket][None, :, :]).mean(axis=2)
+            for a, b in zip(*np.nonzero(np.triu(agree >= similarity, k=1))):
+                i, j = int(bucket[a]), int(bucket[b])
+                if uf.find(i) == uf.find(j):
+                    continue
+                if accept is None or accept(i, j):
+                    uf.union(i, j)
+
+    return [uf.find(i) for i in range(n)]
+
+
+def cluster_counts(counter, similarity=SIMILARITY):
+    """Cluster a token Counter.
+
+    Returns (clustered Counter keyed by canonical form, raw token ->
+    canonical form). Tokens that normalize to nothing (punctuation-only
+    spans) only lose their surrounding whitespace. The canonical form is
+    the cluster's most frequent normalized key.
+    """
+    key_counts = Counter()
+    raw_to_key = {}
+    for token, count in counter.items():
+        key = normalize(token) or token.strip() or token
+        raw_to_key[token] = key
+        key_counts[key] += count
+
+    keys = sorted(key_counts)
+    if not keys:
+        return Counter(), {}
+    roots = lsh_groups(minhash_signatures(keys), similarity=similarity,
+                       accept=lambda i, j: same_variant(keys[i], keys[j]))
+
+    members = {}
+    for key, root in zip(keys, roots):
+        members.setdefault(root, []).append(key)
+    canonical = {}
+    for group in members.values():
+        best = max(group, key=lambda k: (key_counts[k], -len(k), k))
+        for key in group:
+            canonical[key] = best
+
+    mapping = {token: canonical[key] for token, key in raw_to_key.items()}
+    clustered = Counter()
+    for token, count in counter.items():
+        clustered[mapping[token]] += count
+    return clustered, mapping
+
+
+def save_clusters(lang, clustered, mapping, counter, results_dir=RESULTS_DIR):
+    """Cluster table with its size and most frequent raw variants."""
+    variants = {}
+    for token, canonical in mapping.items():
+        variants.setdefault(canonical, []).append(token)
+
+    output_path = os.path.join(results_dir, f'disfluency_clusters_{lang}.csv')
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['Cluster', 'Frequency', 'Variants', 'Top_Variants'])
+        for canonical, frequency in clustered.most_common():
+            tokens = sorted(variants[canonical], key=lambda t: -counter[t])
+            writer.writerow([canonical, frequency, len(tokens), ' | '.join(repr(t) for t in tokens[:5])])
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--similarity', type=float, default=SIMILARITY)
+    args = parser.parse_args()
+
+    from analyze_disfluency_tokens import DATA_FILE, analyze_disfluencies_per_language
+
+    with open(DATA_FILE, 'r', encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    language_disfluencies = analyze_disfluencies_per_language(rows)
+    print()
+
+    for lang, counter in sorted(language_disfluencies.items()):
+        start = time.perf_counter()
+        clustered, mapping = cluster_counts(counter, args.similarity)
+        elapsed = time.perf_counter() - start
+        path = save_clusters(lang, clustered, mapping, counter)
+        top = ', '.join(f"{c} ({n})" for c, n in clustered.most_common(4))
+        print(f"{lang}: {len(counter)} variants -> {len(clustered)} clusters in {elapsed:.2f}s; {top}")
+        print(f"  Saved: {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,338 @@
+"""Tag disfluency spans as INTJ, PRN or EDITED with a per-language Aho-Corasick lexicon.
+
+Adjacent spans (`_you_ _know_`) are joined into one phrase. Phrases are
+matched against the lexicon in a single automaton pass per cell; phrases
+with words the lexicon does not cover are EDITED when those words repeat
+right after the span (`_the_ the`) or are cut off (`_th-_`), and OTHER
+when nothing applies.
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import unicodedata
+from bisect import bisect_right
+from collections import Counter, deque
+
+# Configuration
+DATA_FILE = 'data/uh-mazing.csv'
+LEXICON_FILE = 'data/span_lexicon.json'
+RESULTS_DIR = 'outputs/results'
+SUMMARY_FILE = 'outputs/results/span_types.csv'
+MIN_SEED_FREQUENCY = 2
+# Words after a span searched for the repeated reparandum
+REPEAT_WINDOW = 3
+
+TYPES = ['INTJ', 'PRN', 'EDITED', 'OTHER']
+
+# Hand-picked seeds; `seed` extends them with the observed variants in
+# outputs/results/disfluency_tokens_<LANG>.csv. Annotators often kept the
+# English filler, so the EN seeds apply to every language.
+SEEDS = {
+    'EN': {
+        'INTJ': ['uh', 'um', 'uh-huh', 'oh', 'ah', 'huh', 'hmm', 'mm', 'yeah', 'well', 'like', 'so', 'okay'],
+        'PRN': ['you know', 'i mean', 'i think', 'i guess', 'you see', 'kind of', 'sort of', 'let me see'],
+    },
+    'AR': {
+        'INTJ': ['آه', 'أه', 'اه', 'إيه', 'ام', 'أم'],
+        'PRN': ['أنت تعرف', 'تعرف', 'تعلم', 'أعني', 'يعني', 'أظن'],
+    },
+    'CS': {
+        'INTJ': ['ehm', 'eh', 'hm', 'no', 'jo', 'ach', 'ano', 'jako', 'tak'],
+        'PRN': ['víš', 'víte', 'vědí', 'myslím', 'chci říct', 'myslím si'],
+    },
+    'DE': {
+        'INTJ': ['ähm', 'äh', 'ja', 'nun', 'also', 'naja', 'hm'],
+        'PRN': ['weißt du', 'wissen sie', 'sie wissen', 'du weißt', 'ich meine', 'ich denke'],
+    },
+    'ES': {
+        'INTJ': ['eh', 'este', 'pues', 'bueno', 'sí', 'mm'],
+        'PRN': ['sabes', 'quiero decir', 'o sea', 'creo', 'digo'],
+    },
+    'FR': {
+        'INTJ': ['euh', 'eum', 'ouais', 'bon', 'ben', 'bah', 'genre'],
+        'PRN': ['tu sais', 'vous savez', 'je veux dire', 'je pense', 'tu vois', 'enfin'],
+    },
+    'HI': {
+        'INTJ': ['हाँ', 'हां', 'अं', 'उम', 'ओह', 'अच्छा'],
+        'PRN': ['पता है', 'मेरा मतलब है', 'मतलब', 'मुझे लगता है'],
+    },
+    'IT': {
+        'INTJ': ['eh', 'ehm', 'beh', 'sì', 'tipo', 'allora'],
+        'PRN': ['sai', 'voglio dire', 'cioè', 'credo', 'penso'],
+    },
+    'ZH': {
+        'INTJ': ['呃', '嗯', '哦', '啊', '对', '是的', '是啊', '好吧', '那个', '就是'],
+        'PRN': ['你知道', '意思是', '我是说', '我觉得', '我猜', '你看', '像是'],
+    },
+}
+
+SPAN = re.compile(r'_([^_]+)_')
+HAN = re.compile(r'[㐀-鿿]')
+HAN_GAP = re.compile(r'(?<=[㐀-鿿]) (?=[㐀-鿿])')
+WORD = re.compile(r"[^\W_]+(?:['\-][^\W_]*)*")
+
+
+def normalize(text):
+    """Lowercase, collapse whitespace, trim punctuation, join Han characters."""
+    text = re.sub(r'\s+', ' ', str(text).lower())
+    start, end = 0, len(text)
+    while start < end and (text[start] == ' ' or unicodedata.category(text[start]).startswith('P')):
+        start += 1
+    while end > start and (text[end - 1] == ' ' or unicodedata.category(text[end - 1]).startswith('P')):
+        end -= 1
+    return HAN_GAP.sub('', text[start:end])
+
+
+# ------------------------------------------------------------
+# AUTOMATON
+# ------------------------------------------------------------
+
+class Automaton:
+    """Aho-Corasick automaton over lexicon entries, built once per language."""
+
+    def __init__(self, patterns):
+        """`patterns` maps entry text to its type."""
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+
+        for pattern, label in patterns.items():
+            node = 0
+            for ch in pattern:
+                if ch not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                    self.goto[node][ch] = len(self.goto) - 1
+                node = self.goto[node][ch]
+            self.out[node].append((len(pattern), label))
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and ch not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(ch, 0)
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+
+    def search(self, text):
+        """Yield (start, end, label) for every entry occurring in `text`."""
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for length, label in self.out[node]:
+                yield i + 1 - length, i + 1, label
+
+
+def is_boundary(text, start, end):
+    """Matches must not cut a word in two; Han text has no word spaces."""
+    before = text[start - 1] if start > 0 else ' '
+    after = text[end] if end < len(text) else ' '
+    first, last = text[start], text[end - 1]
+    ok_before = HAN.match(first) or not (before.isalnum() and first.isalnum())
+    ok_after = HAN.match(last) or not (after.isalnum() and last.isalnum())
+    return bool(ok_before and ok_after)
+
+
+# ------------------------------------------------------------
+# LEXICON
+# ------------------------------------------------------------
+
+def load_lexicon(path=LEXICON_FILE):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def lexicon_patterns(lexicon, lang):
+    """Entry -> type for one language, EN entries included; PRN wins clashes."""
+    patterns = {}
+    for source in ['EN', lang]:
+        for label in ['INTJ', 'PRN']:
+            for entry in lexicon.get(source, {}).get(label, {}):
+                if patterns.get(entry) != 'PRN':
+                    patterns[entry] = label
+    return patterns
+
+
+def seed_lexicon(results_dir=RESULTS_DIR, min_frequency=MIN_SEED_FREQUENCY):
+    """Seed entries plus frequent table tokens that contain a seed as a whole word."""
+    lexicon = {}
+    for lang, seeds in SEEDS.items():
+        entries = {label: {normalize(s): 0 for s in seeds[label]} for label in ['INTJ', 'PRN']}
+        automaton = Automaton(lexicon_patterns({'EN': SEEDS['EN'], lang: seeds}, lang))
+
+        path = os.path.join(results_dir, f'disfluency_tokens_{lang}.csv')
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                token = normalize(row['Token'])
+                frequency = int(row['Frequency'])
+                if not token or frequency < min_frequency:
+                    continue
+                matches = [m for m in automaton.search(token) if is_boundary(token, m[0], m[1])]
+                if not matches:
+                    continue
+                # The longest seed inside the token decides its type
+                label = max(matches, key=lambda m: (m[1] - m[0], m[2] == 'PRN'))[2]
+                entries[label][token] = entries[label].get(token, 0) + frequency
+
+        lexicon[lang] = {label: dict(sorted(e.items(), key=lambda x: (-x[1], x[0])))
+                         for label, e in entries.items()}
+    return lexicon
+
+
+def save_lexicon(lexicon, path=LEXICON_FILE):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(lexicon, f, ensure_ascii=False, indent=1)
+        f.write('\n')
+
+
+# ------------------------------------------------------------
+# CLASSIFIER
+# ------------------------------------------------------------
+
+def span_phrases(text):
+    """Group adjacent spans into phrases of (normalized text, raw tokens, end offset)."""
+    phrases = []
+    current, raw = [], []
+    prev_end = None
+
+    for match in SPAN.finditer(text):
+        token = normalize(match.group(1))
+        # Stray underscores between spans (`_你___知道_`) do not break a phrase
+        contiguous = prev_end is not None and not text[prev_end:match.start()].strip(' _')
+        if current and (not token or not contiguous):
+            phrases.append((HAN_GAP.sub('', ' '.join(current)), raw, prev_end))
+            current, raw = [], []
+        if token:
+            current.append(token)
+            raw.append(match.group(1).lower())
+        prev_end = match.end()
+
+    if current:
+        phrases.append((HAN_GAP.sub('', ' '.join(current)), raw, prev_end))
+    return phrases
+
+
+def is_repetition(words, following, window=REPEAT_WINDOW):
+    """Uncovered words repeat inside the phrase or soon after it, or are cut off."""
+    if not words:
+        return False
+    if any(w.endswith('-') for w in words) or len(set(words)) < len(words):
+        return True
+    if HAN.match(words[0]):
+        return bool(following) and following[0].startswith(words[0][0])
+    # `_it_ _'s_ it's` splits differently on each side of the span
+    return words[0] in [w.split("'")[0] for w in following[:window]]
+
+
+class SpanClassifier:
+    """Compiled per-language automata over a lexicon."""
+
+    def __init__(self, lexicon=None):
+        self.lexicon = load_lexicon() if lexicon is None else lexicon
+        self.automata = {}
+
+    def automaton(self, lang):
+        if lang not in self.automata:
+            self.automata[lang] = Automaton(lexicon_patterns(self.lexicon, lang))
+        return self.automata[lang]
+
+    def classify(self, text, lang):
+        """Return [(phrase, type, raw tokens)] for one marked-up cell."""
+        if text is None or text != text or text == '':
+            return []
+        text = str(text)
+        phrases = span_phrases(text)
+        if not phrases:
+            return []
+
+        # One pass over all phrases of the cell, separated by newlines
+        joined = '\n'.join(p[0] for p in phrases)
+        starts = []
+        offset = 0
+        for phrase, _, _ in phrases:
+            starts.append(offset)
+            offset += len(phrase) + 1
+
+        matches = [[] for _ in phrases]
+        for start, end, label in self.automaton(lang).search(joined):
+            i = bisect_right(starts, start) - 1
+            if is_boundary(joined, start, end):
+                matches[i].append((start - starts[i], end - starts[i], label))
+
+        results = []
+        for (phrase, raw, end), found in zip(phrases, matches):
+            covered = [False] * len(phrase)
+            for s, e, _ in found:
+                covered[s:e] = [True] * (e - s)
+            uncovered = [m.group() for m in WORD.finditer(phrase)
+                         if not all(covered[m.start():m.end()])]
+
+            if found and not uncovered:
+                label = max(found, key=lambda m: (m[1] - m[0], m[2] == 'PRN'))[2]
+            elif is_repetition(uncovered, WORD.findall(normalize(text[end:end + 80].replace('_', ' ')))):
+                label = 'EDITED'
+            elif found:
+                label = max(found, key=lambda m: (m[1] - m[0], m[2] == 'PRN'))[2]
+            else:
+                label = 'OTHER'
+            results.append((phrase, label, raw))
+
+        return results
+
+
+def classify_rows(rows, classifier=None):
+    """Yield (ID, language, phrase, type) for every phrase in the dataset."""
+    classifier = classifier or SpanClassifier()
+    for row in rows:
+        for col, text in row.items():
+            if col.endswith('_disfluent'):
+                lang = col.replace('_disfluent', '')
+                for phrase, label, _ in classifier.classify(text, lang):
+                    yield row['ID'], lang, phrase, label
+
+
+def type_counts(rows, classifier=None):
+    """Language -> Counter of span types."""
+    counts = {}
+    for _, lang, _, label in classify_rows(rows, classifier):
+        counts.setdefault(lang, Counter())[label] += 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seed', action='store_true',
+                        help=f'rebuild {LEXICON_FILE} from the seeds and token frequency tables')
+    args = parser.parse_args()
+
+    if args.seed or not os.path.exists(LEXICON_FILE):
+        lexicon = seed_lexicon()
+        save_lexicon(lexicon)
+        sizes = {lang: sum(len(e) for e in entries.values()) for lang, entries in lexicon.items()}
+        print(f"✓ Seeded {LEXICON_FILE}: {sizes}\n")
+
+    with open(DATA_FILE, 'r', encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    counts = type_counts(rows)
+
+    with open(SUMMARY_FILE, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['Language'] + TYPES + ['Total'])
+        for lang in sorted(counts):
+            writer.writerow([lang] + [counts[lang][t] for t in TYPES] + [sum(counts[lang].values())])
+            shares = ', '.join(f"{t} {counts[lang][t]}" for t in TYPES)
+            print(f"  {lang}: {shares}")
+    print(f"\n✓ Saved to {SUMMARY_FILE}")
+
+
+if __name__ == '__main__':
+    main()
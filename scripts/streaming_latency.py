@@ -0,0 +1,228 @@
+"""Replay turns on a simulated clock through a streaming backend and measure latency.
+
+Each timed turn is fed word by word between its `start_time` and
+`end_time`, in chunks, to one streaming session per target language. All
+conversations share one clock and a fixed number of workers; chunks wait
+in a FIFO when every worker is busy, and a session's chunks run in order.
+Per segment we record first-output latency (first output - start_time) and
+final-output lag (last output - end_time); per language we report their
+p50/p95/p99 and the source words processed per simulated second.
+"""
+
+import argparse
+import heapq
+import time
+from collections import deque
+from itertools import count
+
+import numpy as np
+import pandas as pd
+
+from backends import load_backend
+from run_inference import LANGUAGE_NAMES, TARGET_LANGUAGES, source_text
+
+# Configuration
+DATA_FILE = 'data/uh-mazing.csv'
+OUTPUT_FILE = 'outputs/results/streaming_latency.csv'
+CHUNK_WORDS = 2
+WORKERS = 4
+PERCENTILES = [50, 95, 99]
+
+
+# ------------------------------------------------------------
+# BACKENDS
+# ------------------------------------------------------------
+
+class EchoStreamingBackend:
+    """Local dummy backend: wait-k echo of the source words with a modeled compute cost.
+
+    A session holds back the last `lookahead` words, as a simultaneous
+    translation policy would, and flushes them when the turn ends.
+    """
+
+    name = 'echo'
+    lookahead = 2
+    base_seconds = 0.05
+    seconds_per_char = 0.002
+
+    def cost(self, text):
+        """Simulated compute seconds for one call."""
+        return self.base_seconds + self.seconds_per_char * len(text)
+
+    def start(self, target_language):
+        return EchoSession(self.lookahead)
+
+
+class EchoSession:
+    def __init__(self, lookahead):
+        self.lookahead = lookahead
+        self.words = []
+        self.emitted = 0
+
+    def feed(self, text):
+        self.words.extend(text.split())
+        ready = max(self.emitted, len(self.words) - self.lookahead)
+        out = self.words[self.emitted:ready]
+        self.emitted = ready
+        return [' '.join(out)] if out else []
+
+    def finish(self):
+        out = self.words[self.emitted:]
+        self.emitted = len(self.words)
+        return [' '.join(out)] if out else []
+
+
+BACKENDS = {
+    'echo': EchoStreamingBackend,
+}
+
+
+def call_backend(backend, session, text, last):
+    """Run one chunk; returns (outputs, simulated seconds).
+
+    Backends without a `cost` model are charged their measured wall time.
+    """
+    start = time.perf_counter()
+    outputs = session.feed(text) if text else []
+    if last:
+        outputs += session.finish()
+    if hasattr(backend, 'cost'):
+        return outputs, backend.cost(text)
+    return outputs, time.perf_counter() - start
+
+
+# ------------------------------------------------------------
+# REPLAY
+# ------------------------------------------------------------
+
+def turn_chunks(text, start, end, chunk_words=CHUNK_WORDS):
+    """(arrival time, chunk text, is last) with words spread evenly over the turn."""
+    words = source_text(text).split()
+    if not words:
+        return [(end, '', True)]
+    duration = max(end - start, 0.0)
+    chunks = []
+    for i in range(0, len(words), chunk_words):
+        j = min(i + chunk_words, len(words))
+        chunks.append((start + duration * j / len(words), ' '.join(words[i:j]), j == len(words)))
+    return chunks
+
+
+def load_turns(df):
+    """Timed turns as (ID, start, end, text); untimed turns cannot be replayed."""
+    timed = df.dropna(subset=['start_time', 'end_time'])
+    return list(zip(timed['ID'], timed['start_time'], timed['end_time'], timed['EN_disfluent']))
+
+
+def replay(turns, backend, languages=TARGET_LANGUAGES, workers=WORKERS, chunk_words=CHUNK_WORDS):
+    """Discrete-event replay; returns one metrics row per (ID, language) segment."""
+    events = []
+    order = count()
+    sessions = {}
+
+    for sample_id, start, end, text in turns:
+        chunks = turn_chunks(text, start, end, chunk_words)
+        for lang in languages:
+            sid = (sample_id, lang)
+            sessions[sid] = {
+                'session': backend.start(LANGUAGE_NAMES[lang]),
+                'start': start,
+                'end': end,
+                'words': sum(len(c[1].split()) for c in chunks),
+                'pending': deque(),
+                'busy': False,
+                'first_output': None,
+                'final_output': None,
+            }
+            for arrival, chunk, last in chunks:
+                heapq.heappush(events, (arrival, next(order), 'arrive', sid, (chunk, last)))
+
+    ready = deque()
+    free = workers
+
+    def dispatch(now):
+        nonlocal free
+        while free and ready:
+            sid = ready.popleft()
+            state = sessions[sid]
+            chunk, last = state['pending'].popleft()
+            outputs, seconds = call_backend(backend, state['session'], chunk, last)
+            state['busy'] = True
+            free -= 1
+            heapq.heappush(events, (now + seconds, next(order), 'done', sid, (outputs, last)))
+
+    while events:
+        now, _, kind, sid, payload = heapq.heappop(events)
+        state = sessions[sid]
+        if kind == 'arrive':
+            state['pending'].append(payload)
+            if not state['busy'] and len(state['pending']) == 1:
+                ready.append(sid)
+        else:
+            outputs, last = payload
+            free += 1
+            state['busy'] = False
+            if outputs and state['first_output'] is None:
+                state['first_output'] = now
+            if last:
+                state['final_output'] = now
+            elif state['pending']:
+                ready.append(sid)
+        dispatch(now)
+
+    rows = []
+    for (sample_id, lang), state in sessions.items():
+        first = state['first_output'] if state['first_output'] is not None else state['final_output']
+        rows.append({
+            'ID': sample_id,
+            'Language': lang,
+            'Start': state['start'],
+            'Words': state['words'],
+            'First_Output_s': first - state['start'],
+            'Final_Lag_s': state['final_output'] - state['end'],
+            'Done': state['final_output'],
+        })
+    return pd.DataFrame(rows)
+
+
+def summarize(segments, percentiles=PERCENTILES):
+    """Latency percentiles and throughput per language."""
+    rows = []
+    for lang, part in segments.groupby('Language', sort=True):
+        span = part['Done'].max() - part['Start'].min()
+        row = {'Language': lang, 'Segments': len(part)}
+        for metric in ['First_Output_s', 'Final_Lag_s']:
+            for p, value in zip(percentiles, np.percentile(part[metric], percentiles)):
+                row[f'{metric[:-2]}_p{p}_s'] = round(float(value), 3)
+        row['Words_per_s'] = round(part['Words'].sum() / span, 2) if span > 0 else 0.0
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backend', default='echo', help="registry name or 'package.module:ClassName'")
+    parser.add_argument('--languages', nargs='+', default=TARGET_LANGUAGES)
+    parser.add_argument('--workers', type=int, default=WORKERS, help='concurrent backend calls')
+    parser.add_argument('--chunk-words', type=int, default=CHUNK_WORDS)
+    args = parser.parse_args()
+
+    df = pd.read_csv(DATA_FILE)
+    turns = load_turns(df)
+    backend = load_backend(args.backend, BACKENDS)
+
+    start = time.perf_counter()
+    segments = replay(turns, backend, args.languages, args.workers, args.chunk_words)
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {len(turns)} timed turns ({len(df) - len(turns)} untimed skipped) x "
+          f"{len(args.languages)} languages on {args.workers} workers in {elapsed:.2f}s\n")
+
+    summary = summarize(segments)
+    print(summary.to_string(index=False))
+
+    summary.to_csv(OUTPUT_FILE, index=False)
+    print(f"\n✓ Saved to {OUTPUT_FILE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Sweep the long-span thresholds of detect_annotation_errors in one pass."""
+
+import argparse
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from detect_annotation_errors import (
+    LONG_TOKEN_THRESHOLD, LONG_TOKEN_WORDS, has_sentence_break, is_missing, iter_rows,
+)
+from word_count import count_words
+
+# Configuration
+OUTPUT_FILE = 'outputs/results/threshold_sweep.csv'
+OUTPUT_DIR = 'outputs/figures'
+CHAR_THRESHOLDS = np.arange(10, 201, 5)
+WORD_THRESHOLDS = np.arange(2, 31)
+
+
+def span_features(rows):
+    """Language -> (char lengths, word counts, sentence-break flags) of every span."""
+    spans = {}
+    for row in rows:
+        for col, text in row.items():
+            if not col.endswith('_disfluent') or col == 'EN_disfluent' or is_missing(text):
+                continue
+            lang = col.replace('_disfluent', '')
+            lengths, words, breaks = spans.setdefault(lang, ([], [], []))
+            for token in re.findall(r'_([^_]+)_', str(text)):
+                lengths.append(len(token))
+                words.append(count_words(token))
+                breaks.append(has_sentence_break(token))
+
+    return {lang: tuple(np.asarray(a) for a in arrays) for lang, arrays in spans.items()}
+
+
+def flagged_counts(values, always, thresholds):
+    """Spans flagged at every threshold of one criterion, the others held fixed.
+
+    `always` marks spans the fixed criteria flag anyway. The rest are
+    flagged when value > threshold, so one sort and one searchsorted give
+    the counts for all thresholds at once.
+    """
+    rest = np.sort(values[~always])
+    return always.sum() + len(rest) - np.searchsorted(rest, thresholds, side='right')
+
+
+def sweep(features, char_thresholds=CHAR_THRESHOLDS, word_thresholds=WORD_THRESHOLDS,
+          max_chars=LONG_TOKEN_THRESHOLD, max_words=LONG_TOKEN_WORDS):
+    """Tidy table of flagged counts and error rates per language and threshold."""
+    frames = []
+    for lang, (lengths, words, breaks) in sorted(features.items()):
+        for criterion, values, others, thresholds in [
+            ('chars', lengths, breaks | (words > max_words), char_thresholds),
+            ('words', words, breaks | (lengths > max_chars), word_thresholds),
+        ]:
+            flagged = flagged_counts(values, others, thresholds)
+            frames.append(pd.DataFrame({
+                'Language': lang,
+                'Criterion': criterion,
+                'Threshold': thresholds,
+                'Flagged': flagged,
+                'Total_Tokens': len(values),
+                'Error_Rate_%': np.round(flagged / max(len(values), 1) * 100, 2),
+            }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def plot_sweep(table, output_dir=OUTPUT_DIR, max_chars=LONG_TOKEN_THRESHOLD, max_words=LONG_TOKEN_WORDS):
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+    for ax, criterion, current, unit in [
+        (axes[0], 'chars', max_chars, 'chars'),
+        (axes[1], 'words', max_words, 'words'),
+    ]:
+        subset = table[table['Criterion'] == criterion]
+        for lang, curve in subset.groupby('Language'):
+            ax.plot(curve['Threshold'], curve['Flagged'], marker='o', markersize=3, linewidth=1.5, label=lang)
+        ax.axvline(x=current, color='red', linestyle='--', linewidth=2, label=f'Current ({current} {unit})')
+        ax.set_xlabel(f'Threshold ({unit})', fontweight='bold', fontsize=12)
+        ax.set_ylabel('Flagged Spans', fontweight='bold', fontsize=12)
+        ax.set_title(f'Flagged Spans vs {unit.capitalize()} Threshold', fontweight='bold', fontsize=14, pad=15)
+        ax.grid(alpha=0.3)
+        ax.legend(fontsize=9, ncol=2)
+
+    plt.tight_layout()
+    output_path = os.path.join(output_dir, 'threshold_sweep.png')
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    print(f"Saved: {output_path}")
+    plt.close()
+
+
+def run(charts=True):
+    features = span_features(iter_rows())
+    table = sweep(features)
+    table.to_csv(OUTPUT_FILE, index=False)
+
+    current = table[(table['Criterion'] == 'chars') & (table['Threshold'] == LONG_TOKEN_THRESHOLD)]
+    print(f"Swept {len(CHAR_THRESHOLDS)} char and {len(WORD_THRESHOLDS)} word thresholds "
+          f"over {sum(len(f[0]) for f in features.values())} spans\n")
+    print(f"At {LONG_TOKEN_THRESHOLD} chars / {LONG_TOKEN_WORDS} words:")
+    print(current[['Language', 'Flagged', 'Total_Tokens', 'Error_Rate_%']].to_string(index=False))
+    print(f"\n✓ Saved to {OUTPUT_FILE}")
+
+    if charts:
+        plot_sweep(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--no-charts', action='store_true')
+    args = parser.parse_args()
+    run(charts=not args.no_charts)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""Per-conversation time index over turn timestamps."""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Configuration
+DATA_FILE = 'data/uh-mazing.csv'
+OUTPUT_FILE = 'outputs/results/disfluency_rates.csv'
+
+ID_PATTERN = r'^(?P<conversation>[^_]+)_(?P<speaker>[^_]+)_(?P<turn>\d+)$'
+SPAN_PATTERN = r'_[^_]+_'
+
+
+def parse_ids(ids):
+    """Split `sw2005_B_2` style IDs into conversation, speaker and turn columns."""
+    parts = pd.Series(ids).str.extract(ID_PATTERN)
+    parts['turn'] = pd.to_numeric(parts['turn'])
+    return parts
+
+
+class TimelineIndex:
+    """Sorted start/end arrays per conversation, built once."""
+
+    def __init__(self, df):
+        timed = df.dropna(subset=['start_time', 'end_time']).reset_index(drop=True)
+        self.untimed = len(df) - len(timed)
+        self.df = pd.concat([timed, parse_ids(timed['ID'])], axis=1)
+
+        self.conversations = {}
+        for conv, group in self.df.groupby('conversation'):
+            group = group.sort_values('start_time')
+            ends = group['end_time'].to_numpy()
+            self.conversations[conv] = {
+                'starts': group['start_time'].to_numpy(),
+                'ends': ends,
+                # Running max of end times keeps the array sorted for searchsorted
+                'max_ends': np.maximum.accumulate(ends),
+                'rows': group.index.to_numpy(),
+            }
+
+    def overlapping(self, conversation, t0, t1):
+        """Turns that overlap the interval (t0, t1)."""
+        conv = self.conversations[conversation]
+        hi = np.searchsorted(conv['starts'], t1, side='left')
+        lo = np.searchsorted(conv['max_ends'], t0, side='right')
+        if lo >= hi:
+            return self.df.iloc[[]]
+        mask = conv['ends'][lo:hi] > t0
+        return self.df.loc[conv['rows'][lo:hi][mask]]
+
+    def within(self, conversation, t0, t1):
+        """Turns that lie entirely inside [t0, t1]."""
+        conv = self.conversations[conversation]
+        lo = np.searchsorted(conv['starts'], t0, side='left')
+        hi = np.searchsorted(conv['starts'], t1, side='right')
+        mask = conv['ends'][lo:hi] <= t1
+        return self.df.loc[conv['rows'][lo:hi][mask]]
+
+
+def rate_table(df):
+    """Vectorized speaking rate and disfluencies per second for every row.
+
+    Speaking rate counts EN words (the audio is English); disfluency rates
+    count marked spans per language against the same turn duration.
+    """
+    duration = (df['end_time'] - df['start_time']).to_numpy()
+    duration = np.where(duration > 0, duration, np.nan)
+
+    en_words = df['EN_disfluent'].fillna('').str.replace('_', ' ', regex=False).str.split().str.len()
+    table = pd.DataFrame({
+        'ID': df['ID'],
+        'Duration': duration,
+        'EN_Words_Per_Sec': en_words.to_numpy() / duration,
+    })
+
+    for col in [c for c in df.columns if c.endswith('_disfluent')]:
+        lang = col.replace('_disfluent', '')
+        spans = df[col].fillna('').str.count(SPAN_PATTERN).to_numpy()
+        table[f'{lang}_Spans'] = spans
+        table[f'{lang}_Disfl_Per_Sec'] = spans / duration
+
+    return table
+
+
+def language_summary(table):
+    """Pooled disfluencies per second of speech for each language."""
+    total_seconds = np.nansum(table['Duration'])
+    rows = []
+    for col in [c for c in table.columns if c.endswith('_Spans')]:
+        lang = col.replace('_Spans', '')
+        valid = ~np.isnan(table['Duration'])
+        rows.append({
+            'Language': lang,
+            'Spans': int(table.loc[valid, col].sum()),
+            'Seconds': round(total_seconds, 2),
+            'Disfl_Per_Sec': round(table.loc[valid, col].sum() / total_seconds, 4),
+            'Median_Turn_Disfl_Per_Sec': round(float(np.nanmedian(table[f'{lang}_Disfl_Per_Sec'])), 4),
+        })
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--conversation', help='conversation ID, e.g. sw2005')
+    parser.add_argument('--window', nargs=2, type=float, metavar=('START', 'END'),
+                        help='seconds; lists turns overlapping this window')
+    args = parser.parse_args()
+
+    df = pd.read_csv(DATA_FILE)
+    index = TimelineIndex(df)
+    print(f"Indexed {len(index.df)} turns in {len(index.conversations)} conversations "
+          f"({index.untimed} without timestamps)\n")
+
+    if args.conversation and args.window:
+        t0, t1 = args.window
+        turns = index.overlapping(args.conversation, t0, t1)
+        print(f"Turns overlapping {t0:g}-{t1:g}s in {args.conversation}:")
+        for _, turn in turns.iterrows():
+            print(f"  {turn['ID']}: {turn['start_time']:.2f}-{turn['end_time']:.2f}s")
+        if len(turns):
+            print()
+            print(language_summary(rate_table(turns)).to_string(index=False))
+        return
+
+    table = rate_table(index.df)
+    summary = language_summary(table)
+    print(f"EN speaking rate: {np.nanmedian(table['EN_Words_Per_Sec']):.2f} words/s (median turn)\n")
+    print(summary.to_string(index=False))
+
+    summary.to_csv(OUTPUT_FILE, index=False)
+    print(f"\n✓ Saved to {OUTPUT_FILE}")
+
+
+if __name__ == '__main__':
+    main()
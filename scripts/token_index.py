@@ -0,0 +1,165 @@
+"""Inverted index from normalized disfluency token to its occurrences."""
+
+import argparse
+import json
+import os
+import re
+import time
+import unicodedata
+from bisect import bisect_left
+
+import pandas as pd
+
+# Configuration
+DATA_FILE = 'data/uh-mazing.csv'
+INDEX_FILE = 'data/uh-mazing.index.json'
+
+
+def normalize_token(token):
+    """Lowercase, collapse whitespace and trim surrounding punctuation."""
+    token = re.sub(r'\s+', ' ', str(token).lower())
+    start, end = 0, len(token)
+    while start < end and (token[start] == ' ' or unicodedata.category(token[start]).startswith('P')):
+        start += 1
+    while end > start and (token[end - 1] == ' ' or unicodedata.category(token[end - 1]).startswith('P')):
+        end -= 1
+    return token[start:end]
+
+
+def build_index(df):
+    """Map language -> normalized token -> [ID, offset, raw span] postings."""
+    postings = {}
+    context = {}
+
+    for _, row in df.iterrows():
+        context[row['ID']] = row['EN_disfluent']
+        for col in row.index:
+            if not col.endswith('_disfluent') or pd.isna(row[col]):
+                continue
+            lang = col.replace('_disfluent', '')
+            lang_postings = postings.setdefault(lang, {})
+            for match in re.finditer(r'_([^_]+)_', str(row[col])):
+                key = normalize_token(match.group(1))
+                if key:
+                    lang_postings.setdefault(key, []).append(
+                        [row['ID'], match.start(1), match.group(1)]
+                    )
+
+    return {'postings': postings, 'context': context}
+
+
+def save_index(index, data_file=DATA_FILE, index_file=INDEX_FILE):
+    stat = os.stat(data_file)
+    index = dict(index, source_mtime=stat.st_mtime, source_size=stat.st_size)
+    with open(index_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+
+
+class TokenIndex:
+    """Query API over the persisted index."""
+
+    def __init__(self, index):
+        self.postings = index['postings']
+        self.context = index['context']
+        self.sorted_keys = {lang: sorted(tokens) for lang, tokens in self.postings.items()}
+        self.by_id = {}
+        for lang, tokens in self.postings.items():
+            for key, plist in tokens.items():
+                for sample_id, offset, raw in plist:
+                    self.by_id.setdefault((sample_id, lang), []).append((offset, key, raw))
+        for spans in self.by_id.values():
+            spans.sort()
+
+    @classmethod
+    def load(cls, data_file=DATA_FILE, index_file=INDEX_FILE):
+        """Load the persisted index, rebuilding it if the dataset has changed."""
+        stat = os.stat(data_file)
+        if os.path.exists(index_file):
+            with open(index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('source_mtime') == stat.st_mtime and index.get('source_size') == stat.st_size:
+                return cls(index)
+
+        index = build_index(pd.read_csv(data_file))
+        save_index(index, data_file, index_file)
+        return cls(index)
+
+    def _hits(self, lang, key, sample_id, offset, raw):
+        return {
+            'ID': sample_id,
+            'Language': lang,
+            'Token': key,
+            'Offset': offset,
+            'Span': raw,
+            'EN_disfluent': self.context.get(sample_id),
+        }
+
+    def _languages(self, lang):
+        return [lang] if lang else sorted(self.postings)
+
+    def exact(self, token, lang=None):
+        key = normalize_token(token)
+        results = []
+        for code in self._languages(lang):
+            for sample_id, offset, raw in self.postings.get(code, {}).get(key, []):
+                results.append(self._hits(code, key, sample_id, offset, raw))
+        return results
+
+    def prefix(self, prefix, lang=None):
+        key_prefix = normalize_token(prefix)
+        results = []
+        for code in self._languages(lang):
+            keys = self.sorted_keys.get(code, [])
+            i = bisect_left(keys, key_prefix)
+            while i < len(keys) and keys[i].startswith(key_prefix):
+                for sample_id, offset, raw in self.postings[code][keys[i]]:
+                    results.append(self._hits(code, keys[i], sample_id, offset, raw))
+                i += 1
+        return results
+
+    def cross_language(self, token, source_lang, target_lang):
+        """Spans in `target_lang` for every ID where `token` occurs in `source_lang`."""
+        results = []
+        seen = set()
+        for hit in self.exact(token, source_lang):
+            if hit['ID'] in seen:
+                continue
+            seen.add(hit['ID'])
+            for offset, key, raw in self.by_id.get((hit['ID'], target_lang), []):
+                results.append(self._hits(target_lang, key, hit['ID'], offset, raw))
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('query', nargs='?', help='token to look up (omit to just build)')
+    parser.add_argument('--lang', help='restrict to one language, e.g. CS')
+    parser.add_argument('--prefix', action='store_true', help='prefix instead of exact match')
+    parser.add_argument('--target', help='cross-language lookup: show spans in this language')
+    args = parser.parse_args()
+
+    index = TokenIndex.load()
+    print(f"Index: {INDEX_FILE} ({sum(len(t) for t in index.postings.values())} token types)")
+
+    if not args.query:
+        return
+
+    start = time.perf_counter()
+    if args.target:
+        if not args.lang:
+            parser.error('--target requires --lang')
+        results = index.cross_language(args.query, args.lang, args.target)
+    elif args.prefix:
+        results = index.prefix(args.query, args.lang)
+    else:
+        results = index.exact(args.query, args.lang)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{len(results)} occurrences ({elapsed_ms:.3f} ms)\n")
+    for hit in results:
+        print(f"[{hit['ID']}] {hit['Language']} @{hit['Offset']}: {hit['Span']!r}")
+        print(f"  EN: {hit['EN_disfluent']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""Content-addressed disk cache for model translation outputs."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+# Configuration
+CACHE_PATH = 'outputs/cache/translations.sqlite'
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+
+def make_key(model, prompt_template, source, target_language):
+    """Hash (model, prompt template, input, target language) into a cache key.
+
+    `source` is either the input text or the raw bytes of an audio segment.
+    """
+    if isinstance(source, bytes):
+        source_digest = 'audio:' + hashlib.sha256(source).hexdigest()
+    else:
+        source_digest = 'text:' + hashlib.sha256(str(source).encode('utf-8')).hexdigest()
+
+    payload = json.dumps([model, prompt_template, source_digest, target_language],
+                         ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# The LRU clock is read inside each write, so runners sharing the file share one clock
+NEXT_TICK = '(SELECT COALESCE(MAX(last_used), 0) + 1 FROM entries)'
+
+
+class TranslationCache:
+    """SQLite-backed cache with a byte size cap and LRU eviction."""
+
+    def __init__(self, path=CACHE_PATH, max_bytes=MAX_CACHE_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            ' key TEXT PRIMARY KEY,'
+            ' output TEXT NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' last_used INTEGER NOT NULL)'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_last_used ON entries (last_used)')
+        self.conn.commit()
+
+    def get(self, model, prompt_template, source, target_language):
+        """Return the cached output, or None on a miss."""
+        key = make_key(model, prompt_template, source, target_language)
+        with self._lock:
+            row = self.conn.execute('SELECT output FROM entries WHERE key = ?', (key,)).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.conn.execute(f'UPDATE entries SET last_used = {NEXT_TICK} WHERE key = ?', (key,))
+            self.conn.commit()
+            return row[0]
+
+    def put(self, model, prompt_template, source, target_language, output):
+        """Store an output and evict least recently used entries over the cap."""
+        key = make_key(model, prompt_template, source, target_language)
+        size = len(output.encode('utf-8'))
+
+        with self._lock:
+            self.conn.execute(
+                f'INSERT OR REPLACE INTO entries (key, output, size, last_used) VALUES (?, ?, ?, {NEXT_TICK})',
+                (key, output, size)
+            )
+            self._evict()
+            self.conn.commit()
+
+    def get_or_compute(self, model, prompt_template, source, target_language, compute):
+        """Return the cached output, calling `compute()` only on a miss."""
+        output = self.get(model, prompt_template, source, target_language)
+        if output is None:
+            output = compute()
+            self.put(model, prompt_template, source, target_language, output)
+        return output
+
+    def total_bytes(self):
+        return self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    def _evict(self):
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+
+        cursor = self.conn.execute('SELECT key, size FROM entries ORDER BY last_used ASC')
+        stale = []
+        for key, size in cursor:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+
+        self.conn.executemany('DELETE FROM entries WHERE key = ?', stale)
+        self.evictions += len(stale)
+
+    def stats(self):
+        """Hit/miss statistics for this session plus current cache size."""
+        lookups = self.hits + self.misses
+        entries = self.conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': self.total_bytes(),
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    cache = TranslationCache()
+    stats = cache.stats()
+    print(f"Cache: {cache.path}")
+    print(f"  Entries: {stats['entries']}")
+    print(f"  Size: {stats['bytes'] / 1024 / 1024:.2f} MB (cap {cache.max_bytes / 1024 / 1024:.0f} MB)")
+    cache.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+"""Batched TTS synthesis of every *_disfluent text into a content-addressed audio cache."""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from backends import load_backend
+from run_inference import source_text
+
+# Configuration
+DATA_FILE = 'data/uh-mazing.csv'
+AUDIO_DIR = 'outputs/cache/audio'
+MAX_BATCH_SIZE = 16
+SAMPLE_RATE = 16000
+DEFAULT_VOICE = 'default'
+
+# Per-language voice; languages not listed use DEFAULT_VOICE
+VOICES = {}
+
+
+# ------------------------------------------------------------
+# BACKENDS
+# ------------------------------------------------------------
+
+def silence_wav(seconds, sample_rate=SAMPLE_RATE):
+    """16-bit mono WAV bytes of `seconds` of silence."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(b'\x00\x00' * int(round(seconds * sample_rate)))
+    return buffer.getvalue()
+
+
+class SilenceBackend:
+    """Local dummy backend: silence as long as the text would take to read aloud."""
+
+    name = 'silence'
+    version = '1'
+    chars_per_second = 15.0
+
+    def synthesize_batch(self, texts, language, voice):
+        return [silence_wav(max(len(text), 1) / self.chars_per_second) for text in texts]
+
+
+BACKENDS = {
+    'silence': SilenceBackend,
+}
+
+_backend_instances = {}
+
+
+def engine_id(backend):
+    """Engine name and version; a new version invalidates that engine's audio."""
+    return f"{getattr(backend, 'name', type(backend).__name__)}:{getattr(backend, 'version', '0')}"
+
+
+# ------------------------------------------------------------
+# AUDIO CACHE
+# ------------------------------------------------------------
+
+def make_key(text, language, voice, engine):
+    payload = json.dumps([text, language, voice, engine], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class AudioCache:
+    """One WAV file per key under a two-character fan-out directory."""
+
+    def __init__(self, root=AUDIO_DIR):
+        self.root = root
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], f'{key}.wav')
+
+    def __contains__(self, key):
+        return os.path.exists(self.path(key))
+
+    def put(self, key, audio):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so an interrupted run never leaves a partial file
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(audio)
+        os.replace(tmp_path, path)
+        return path
+
+
+# ------------------------------------------------------------
+# JOBS AND BATCHING
+# ------------------------------------------------------------
+
+def load_cells(df, languages=None):
+    """One (ID, language, text) per non-empty *_disfluent cell, markup stripped."""
+    cells = []
+    for col in df.columns:
+        if not col.endswith('_disfluent'):
+            continue
+        lang = col.replace('_disfluent', '')
+        if languages and lang not in languages:
+            continue
+        for sample_id, value in zip(df['ID'], df[col]):
+            if pd.isna(value):
+                continue
+            text = source_text(value)
+            if text:
+                cells.append({'ID': sample_id, 'language': lang, 'text': text})
+    return cells
+
+
+def plan_jobs(cells, engine, voices=VOICES):
+    """Attach voice and cache key to every cell; one job per distinct key."""
+    jobs = {}
+    for cell in cells:
+        cell['voice'] = voices.get(cell['language'], DEFAULT_VOICE)
+        cell['key'] = make_key(cell['text'], cell['language'], cell['voice'], engine)
+        jobs.setdefault(cell['key'], cell)
+    return list(jobs.values())
+
+
+def make_batches(jobs, max_batch_size=MAX_BATCH_SIZE):
+    """Group jobs by (language, voice), similar lengths together."""
+    groups = {}
+    for job in jobs:
+        groups.setdefault((job['language'], job['voice']), []).append(job)
+
+    batches = []
+    for group in sorted(groups):
+        ordered = sorted(groups[group], key=lambda j: len(j['text']))
+        batches.extend(ordered[i:i + max_batch_size] for i in range(0, len(ordered), max_batch_size))
+    return batches
+
+
+def run_batch(backend_spec, batch):
+    """Synthesize one batch; top-level so process pools can pickle it."""
+    backend = load_backend(backend_spec, BACKENDS, _backend_instances)
+    audio = backend.synthesize_batch([j['text'] for j in batch], batch[0]['language'], batch[0]['voice'])
+    return [(job['key'], clip) for job, clip in zip(batch, audio)]
+
+
+def save_manifest(cells, cache):
+    """Every cell's audio file, written next to the cache."""
+    manifest = pd.DataFrame([{
+        'ID': c['ID'],
+        'Language': c['language'],
+        'Voice': c['voice'],
+        'Key': c['key'],
+        'Audio': cache.path(c['key']),
+    } for c in cells])
+    path = os.path.join(cache.root, 'manifest.csv')
+    os.makedirs(cache.root, exist_ok=True)
+    manifest.to_csv(path, index=False)
+    return path
+
+
+# ------------------------------------------------------------
+# RUNNER
+# ------------------------------------------------------------
+
+def run(backend_spec='silence', languages=None, voices=VOICES, max_batch_size=MAX_BATCH_SIZE,
+        workers=4, pool='thread', audio_dir=AUDIO_DIR):
+    """Synthesize every cell whose (text, language, voice, engine) audio is not cached yet."""
+    df = pd.read_csv(DATA_FILE)
+    cache = AudioCache(audio_dir)
+    engine = engine_id(load_backend(backend_spec, BACKENDS, _backend_instances))
+
+    cells = load_cells(df, languages)
+    jobs = plan_jobs(cells, engine, voices)
+    pending = [job for job in jobs if job['key'] not in cache]
+    print(f"{len(cells)} cells, {len(jobs)} unique texts, "
+          f"{len(jobs) - len(pending)} cached, {len(pending)} to synthesize ({engine})")
+
+    batches = make_batches(pending, max_batch_size)
+    start = time.perf_counter()
+    done = 0
+    if batches:
+        print(f"Dispatching {len(batches)} batches to {workers} {pool} workers...")
+        executor_cls = ProcessPoolExecutor if pool == 'process' else ThreadPoolExecutor
+        with executor_cls(max_workers=workers) as executor:
+            futures = [executor.submit(run_batch, backend_spec, batch) for batch in batches]
+            for future in as_completed(futures):
+                for key, audio in future.result():
+                    cache.put(key, audio)
+                    done += 1
+
+    elapsed = time.perf_counter() - start
+    print(f"\n✓ Synthesized {done} clips in {elapsed:.2f}s")
+    path = save_manifest(cells, cache)
+    print(f"✓ Saved to {path}")
+    return path
+
+
+def parse_voices(pairs):
+    """['ZH=xiaoxiao', ...] -> {'ZH': 'xiaoxiao', ...}"""
+    voices = dict(VOICES)
+    for pair in pairs or []:
+        lang, voice = pair.split('=', 1)
+        voices[lang] = voice
+    return voices
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--backend', default='silence',
+                        help="registry name or 'package.module:ClassName'")
+    parser.add_argument('--languages', nargs='+')
+    parser.add_argument('--voice', nargs='+', metavar='LANG=VOICE', help='per-language voice')
+    parser.add_argument('--batch-size', type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--pool', default='thread', choices=['thread', 'process'])
+    parser.add_argument('--audio-dir', default=AUDIO_DIR)
+    args = parser.parse_args()
+
+    run(args.backend, args.languages, parse_voices(args.voice), args.batch_size,
+        args.workers, args.pool, args.audio_dir)
+
+
+if __name__ == '__main__':
+    main()
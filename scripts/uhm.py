@@ -0,0 +1,106 @@
+"""Unified command line for the Uh-Mazing analysis scripts.
+
+Heavy libraries (pandas, matplotlib, Google APIs) are only imported inside
+the subcommands that need them, so text-only commands start fast.
+
+    python scripts/uhm.py detect [--compress]
+    python scripts/uhm.py targets [--budget-items N] [--budget-minutes M]
+    python scripts/uhm.py tokens [--charts] [--by-cluster]
+    python scripts/uhm.py sweep [--no-charts]
+    python scripts/uhm.py charts
+    python scripts/uhm.py forms {plan,reannotation,translation}
+"""
+
+import argparse
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FORMS_DIR = os.path.join(os.path.dirname(SCRIPTS_DIR), 'forms')
+
+FORM_SCRIPTS = {
+    'plan': 'form_scheduler.py',
+    'reannotation': 'bulk_create_reannotation_forms.py',
+    'translation': 'bulk_create_google_forms.py',
+}
+
+
+def cmd_detect(args):
+    from detect_annotation_errors import run
+    run(args.compress)
+
+
+def cmd_targets(args):
+    from find_reannotation_targets import run
+    run(args.budget_items, args.budget_minutes)
+
+
+def cmd_tokens(args):
+    from analyze_disfluency_tokens import run
+    run(charts=args.charts, by_cluster=args.by_cluster)
+
+
+def cmd_sweep(args):
+    from threshold_sweep import run
+    run(charts=not args.no_charts)
+
+
+def cmd_charts(args):
+    import matplotlib
+    matplotlib.use('Agg')
+
+    import analyze_disfluency_tokens
+    import markup_metrics
+    import plot_error_counts
+    import simple_error_chart
+    import visualize_annotation_errors
+
+    analyze_disfluency_tokens.run(charts=True)
+    markup_metrics.main()
+    visualize_annotation_errors.main()
+    plot_error_counts.main()
+    simple_error_chart.main()
+
+
+def cmd_forms(args):
+    import runpy
+
+    sys.path.insert(0, FORMS_DIR)
+    runpy.run_path(os.path.join(FORMS_DIR, FORM_SCRIPTS[args.task]), run_name='__main__')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='uhm', description='Uh-Mazing analysis toolkit')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('detect', help='detect annotation errors (stdlib only)')
+    p.add_argument('--compress', action='store_true', help='write gzip-compressed reports')
+    p.set_defaults(func=cmd_detect)
+
+    p = sub.add_parser('targets', help='find (ID, language) pairs to reannotate (stdlib only)')
+    p.add_argument('--budget-items', type=int, help='most severe items to keep per language')
+    p.add_argument('--budget-minutes', type=float, help='estimated form minutes per language')
+    p.set_defaults(func=cmd_targets)
+
+    p = sub.add_parser('tokens', help='disfluency token frequency tables (stdlib only)')
+    p.add_argument('--charts', action='store_true', help='also draw per-language charts')
+    p.add_argument('--by-cluster', action='store_true', help='merge near-duplicate variants (MinHash/LSH)')
+    p.set_defaults(func=cmd_tokens)
+
+    p = sub.add_parser('sweep', help='flagged spans for every long-span threshold')
+    p.add_argument('--no-charts', action='store_true')
+    p.set_defaults(func=cmd_sweep)
+
+    p = sub.add_parser('charts', help='regenerate all figures')
+    p.set_defaults(func=cmd_charts)
+
+    p = sub.add_parser('forms', help='plan or create Google Forms')
+    p.add_argument('task', choices=sorted(FORM_SCRIPTS))
+    p.set_defaults(func=cmd_forms)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""Validate EN gold spans by diffing EN_disfluent against EN_fluent."""
+
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# Configuration
+DATA_FILE = 'data/uh-mazing.csv'
+OUTPUT_FILE = 'outputs/results/en_gold_validation.csv'
+CHUNK_SIZE = 256
+
+WORD = re.compile(r"'?[^\W_]+(?:['\-][^\W_]*)*")
+WORD_OR_MARKER = re.compile(r"_|'?[^\W_]+(?:['\-][^\W_]*)*")
+
+
+def tokenize_marked(text):
+    """Lowercased words of a marked-up text and whether each is inside a span."""
+    text = str(text).lower()
+    # With an odd number of underscores the last one opens nothing
+    pairs = text.count('_') // 2 * 2
+
+    words, marked = [], []
+    markers = 0
+    in_span = False
+    for token in WORD_OR_MARKER.findall(text):
+        if token == '_':
+            markers += 1
+            if markers <= pairs:
+                in_span = not in_span
+        else:
+            words.append(token)
+            marked.append(in_span)
+    return words, marked
+
+
+def myers_diff(a, b):
+    """Shortest edit script from `a` to `b` (Myers, O(ND)).
+
+    Returns a list of ('=', i, j), ('-', i, None) and ('+', None, j) ops.
+    """
+    n, m = len(a), len(b)
+    max_d = n + m
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace = []
+
+    for d in range(max_d + 1):
+        # Only diagonals -d-1..d+1 are read at this depth, so keep just that band
+        trace.append(v[offset - d - 1:offset + d + 2])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m, d)
+
+    return []
+
+
+def _backtrack(trace, n, m, d):
+    ops = []
+    x, y = n, m
+    for depth in range(d, 0, -1):
+        band = trace[depth]
+        k = x - y
+        # band[i] holds diagonal i - depth - 1
+        if k == -depth or (k != depth and band[k + depth] < band[k + depth + 2]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = band[prev_k + depth + 1]
+        prev_y = prev_x - prev_k
+
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            ops.append(('=', x, y))
+        if x == prev_x:
+            y -= 1
+            ops.append(('+', None, y))
+        else:
+            x -= 1
+            ops.append(('-', x, None))
+
+    while x > 0 and y > 0:
+        x -= 1
+        y -= 1
+        ops.append(('=', x, y))
+
+    ops.reverse()
+    return ops
+
+
+def group_runs(words, flags):
+    """Join consecutive flagged words into phrases."""
+    phrases, current = [], []
+    for word, flag in zip(words, flags):
+        if flag:
+            current.append(word)
+        elif current:
+            phrases.append(' '.join(current))
+            current = []
+    if current:
+        phrases.append(' '.join(current))
+    return phrases
+
+
+def validate_row(sample_id, disfluent, fluent):
+    """Derive gold spans from the diff and compare them with the markup."""
+    words, marked = tokenize_marked(disfluent)
+    fluent_words = WORD.findall(str(fluent).lower())
+
+    # Diff the reversed sequences so that, among equal-cost scripts, the
+    # later copy of a repeated word is kept: the reparandum precedes the repair
+    n, m = len(words), len(fluent_words)
+    removed = [False] * n
+    fluent_only = []
+    for op, i, j in myers_diff(words[::-1], fluent_words[::-1]):
+        if op == '-':
+            removed[n - 1 - i] = True
+        elif op == '+':
+            fluent_only.append(fluent_words[m - 1 - j])
+    fluent_only.reverse()
+
+    marked_not_removed = [mk and not rm for mk, rm in zip(marked, removed)]
+    removed_not_marked = [rm and not mk for mk, rm in zip(marked, removed)]
+    ok = not any(marked_not_removed) and not any(removed_not_marked) and not fluent_only
+
+    return {
+        'ID': sample_id,
+        'Status': 'ok' if ok else 'mismatch',
+        'Derived_Spans': ' | '.join(group_runs(words, removed)),
+        'Marked_Not_Removed': ' | '.join(group_runs(words, marked_not_removed)),
+        'Removed_Not_Marked': ' | '.join(group_runs(words, removed_not_marked)),
+        'Fluent_Only': ' '.join(fluent_only),
+    }
+
+
+def validate_chunk(rows):
+    """Top-level so worker processes can pickle it."""
+    return [validate_row(*row) for row in rows]
+
+
+def validate(df, workers=None, chunk_size=CHUNK_SIZE):
+    rows = list(zip(df['ID'], df['EN_disfluent'], df['EN_fluent']))
+    chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+
+    if workers == 1 or len(chunks) == 1:
+        return [res for chunk in chunks for res in validate_chunk(chunk)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [res for results in executor.map(validate_chunk, chunks) for res in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--data', default=DATA_FILE)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.data)
+    print(f"Validating {len(df)} EN samples...")
+
+    start = time.perf_counter()
+    results = pd.DataFrame(validate(df, args.workers))
+    elapsed = time.perf_counter() - start
+
+    mismatches = results[results['Status'] == 'mismatch']
+    print(f"Done in {elapsed:.2f}s: {len(results) - len(mismatches)} ok, {len(mismatches)} mismatches\n")
+
+    for _, row in mismatches.head(5).iterrows():
+        print(f"[{row['ID']}]")
+        if row['Marked_Not_Removed']:
+            print(f"  marked but kept in fluent: {row['Marked_Not_Removed']}")
+        if row['Removed_Not_Marked']:
+            print(f"  removed but not marked:    {row['Removed_Not_Marked']}")
+        if row['Fluent_Only']:
+            print(f"  only in fluent:            {row['Fluent_Only']}")
+
+    results.to_csv(OUTPUT_FILE, index=False)
+    print(f"\n✓ Saved to {OUTPUT_FILE}")
+
+
+if __name__ == '__main__':
+    main()
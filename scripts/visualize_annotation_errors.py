@@ -7,6 +7,10 @@ from matplotlib.colors import LinearSegmentedColormap
 import re
 import os
 
+from bootstrap_stats import grouped_ratio_ci
+from detect_annotation_errors import LONG_TOKEN_THRESHOLD
+from error_cube import language_totals, load_cube
+
 OUTPUT_DIR = 'outputs/figures'
 
 def extract_underscored_tokens(text):
@@ -22,19 +26,11 @@ def main():
 
     disfluent_cols = [col for col in df.columns if col.endswith('_disfluent')]
 
-    total_tokens = {}
-    for col in disfluent_cols:
-        lang = col.replace('_disfluent', '')
-        all_tokens = []
-        for text in df[col].dropna():
-            tokens = extract_underscored_tokens(text)
-            all_tokens.extend(tokens)
-        total_tokens[lang] = len(all_tokens)
-
-    error_counts = errors_df['Language'].value_counts().to_dict()
-
-    if 'EN' not in error_counts:
-        error_counts['EN'] = 0
+    # Totals come from the aggregate cube; the segment-level tables are only
+    # needed for the length histogram and the per-sample bootstrap
+    totals = language_totals(load_cube()).set_index('Language')
+    total_tokens = totals['Spans'].to_dict()
+    error_counts = totals['Errors'].to_dict()
 
     languages = sorted(error_counts.keys())
     errors = [error_counts.get(lang, 0) for lang in languages]
@@ -110,7 +106,8 @@ def main():
         ax.hist(lengths, bins=20, alpha=0.6, label=f'{lang} (n={len(lengths)})',
                 color=colors[idx], edgecolor='black', linewidth=0.5)
 
-    ax.axvline(x=50, color='red', linestyle='--', linewidth=2, label='Threshold (50 chars)')
+    ax.axvline(x=LONG_TOKEN_THRESHOLD, color='red', linestyle='--', linewidth=2,
+               label=f'Threshold ({LONG_TOKEN_THRESHOLD} chars)')
 
     ax.set_xlabel('Token Length', fontweight='bold', fontsize=12)
     ax.set_ylabel('Number of Errors', fontweight='bold', fontsize=12)
@@ -127,13 +124,28 @@ def main():
 
     print("\n=== SUMMARY ===\n")
 
+    # Per-sample errors and tokens, so the rate can be bootstrapped over samples
+    sample_errors = errors_df.groupby(['Sample_ID', 'Language']).size()
+    per_sample = []
+    for col in disfluent_cols:
+        lang = col.replace('_disfluent', '')
+        for sample_id, text in zip(df['ID'], df[col]):
+            per_sample.append({
+                'Language': lang,
+                'Errors': sample_errors.get((sample_id, lang), 0),
+                'Tokens': len(extract_underscored_tokens(text)),
+            })
+    intervals = grouped_ratio_ci(pd.DataFrame(per_sample), 'Language', 'Errors', 'Tokens').set_index('Language')
+
     summary_data = []
     for lang in languages:
+        ci = intervals.loc[lang] if lang in intervals.index else {'CI_Low': 0.0, 'CI_High': 0.0}
         summary_data.append({
             'Language': lang,
             'Errors': error_counts.get(lang, 0),
             'Total_Tokens': total_tokens.get(lang, 0),
-            'Error_Rate_%': f"{(error_counts.get(lang, 0) / total_tokens.get(lang, 1) * 100):.2f}"
+            'Error_Rate_%': f"{(error_counts.get(lang, 0) / total_tokens.get(lang, 1) * 100):.2f}",
+            '95%_CI': f"[{ci['CI_Low'] * 100:.2f}, {ci['CI_High'] * 100:.2f}]",
         })
 
     summary_df = pd.DataFrame(summary_data)
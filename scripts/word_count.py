@@ -0,0 +1,178 @@
+"""Script-aware word counting for disfluency spans.
+
+Han text has no spaces, so runs of Han characters are segmented by
+forward maximum matching against a small dictionary trie; characters
+outside any dictionary word count as one word each. Other scripts split
+on whitespace and punctuation (including the Arabic comma and the
+Devanagari danda), with apostrophes and hyphens kept inside words.
+Results are memoized per span string.
+"""
+
+import csv
+import json
+import os
+import unicodedata
+from functools import lru_cache
+
+# Configuration
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOKEN_TABLE = os.path.join(ROOT_DIR, 'outputs/results/disfluency_tokens_ZH.csv')
+LEXICON_FILE = os.path.join(ROOT_DIR, 'data/span_lexicon.json')
+MAX_TABLE_WORD = 4  # longer marked tokens are the spans we want to count, not words
+CACHE_SIZE = 65536
+
+# Common multi-character words; the ZH lexicon and token table add short marked ones
+HAN_WORDS = [
+    '你知道', '知道', '我们', '你们', '他们', '她们', '它们', '我的', '你的', '他的', '我们的', '他们的',
+    '这个', '那个', '这些', '那些', '这样', '那样', '这里', '那里', '什么', '怎么', '为什么', '因为',
+    '所以', '但是', '可是', '而且', '如果', '或者', '还是', '然后', '就是', '不是', '是的', '是啊',
+    '可能', '可以', '应该', '需要', '已经', '现在', '时候', '一些', '一点', '一下', '一个', '一样',
+    '没有', '非常', '真的', '其实', '当然', '觉得', '认为', '意思', '意思是', '我是说', '我觉得',
+    '喜欢', '像是', '好吧', '对吧', '很多', '事情', '东西', '地方', '世界', '时间', '生活', '工作',
+    '孩子', '孩子们', '家人', '家庭', '父母', '母亲', '父亲', '朋友', '养老院', '照顾', '自己', '一直',
+    '还有', '不能', '不会', '不要', '比如', '例如', '有点', '有些', '知道吗', '你看', '我猜', '那么',
+    '怎么样', '不过', '只是',
+]
+
+HAN_RANGES = [(0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xF900, 0xFAFF), (0x20000, 0x2FA1F)]
+JOINERS = {"'", '’', '-', '‐'}
+
+
+def is_han(ch):
+    code = ord(ch)
+    return any(lo <= code <= hi for lo, hi in HAN_RANGES)
+
+
+def is_word_char(ch):
+    """Letters, numbers and combining marks (Devanagari vowel signs are marks)."""
+    return unicodedata.category(ch)[0] in 'LNM'
+
+
+# ------------------------------------------------------------
+# HAN SEGMENTER
+# ------------------------------------------------------------
+
+_trie = None
+_max_len = 1
+
+
+def build_trie(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+    return trie
+
+
+def is_han_word(token):
+    return 1 < len(token) <= MAX_TABLE_WORD and all(is_han(ch) for ch in token)
+
+
+def han_dictionary(table=TOKEN_TABLE, lexicon=LEXICON_FILE):
+    """Built-in words plus short Han entries from the ZH lexicon and token table.
+
+    Only tokens of up to MAX_TABLE_WORD characters are taken: the table also
+    holds long mis-annotated spans, and adding those as single words would
+    hide exactly the spans the long-span checks look for.
+    """
+    words = set(HAN_WORDS)
+    if os.path.exists(lexicon):
+        with open(lexicon, 'r', encoding='utf-8') as f:
+            entries = json.load(f).get('ZH', {})
+        for label in entries.values():
+            words.update(e for e in label if is_han_word(e))
+    if os.path.exists(table):
+        with open(table, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                token = ''.join(row['Token'].split())
+                if is_han_word(token):
+                    words.add(token)
+    return words
+
+
+def load_dictionary(words=None):
+    """(Re)build the trie; the default dictionary loads lazily on first use."""
+    global _trie, _max_len
+    words = han_dictionary() if words is None else words
+    _trie = build_trie(words)
+    _max_len = max((len(w) for w in words), default=1)
+    segment_han.cache_clear()
+    count_words.cache_clear()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def segment_han(run):
+    """Forward maximum matching over a run of Han characters."""
+    if _trie is None:
+        load_dictionary()
+
+    words = []
+    i = 0
+    while i < len(run):
+        node = _trie
+        best = 1
+        for j in range(i, min(len(run), i + _max_len)):
+            node = node.get(run[j])
+            if node is None:
+                break
+            if '' in node:
+                best = j - i + 1
+        words.append(run[i:i + best])
+        i += best
+    return tuple(words)
+
+
+# ------------------------------------------------------------
+# COUNTING
+# ------------------------------------------------------------
+
+def runs(text):
+    """Split text into ('han', run) and ('word', run) pieces, dropping separators."""
+    pieces = []
+    kind, start = None, 0
+    for i, ch in enumerate(text):
+        if is_han(ch):
+            current = 'han'
+        elif is_word_char(ch):
+            current = 'word'
+        elif (ch in JOINERS and kind == 'word' and i + 1 < len(text)
+              and is_word_char(text[i + 1]) and not is_han(text[i + 1])):
+            # it's, c'est, uh-huh stay one word
+            continue
+        else:
+            current = None
+
+        if current != kind:
+            if kind:
+                pieces.append((kind, text[start:i]))
+            kind, start = current, i
+    if kind:
+        pieces.append((kind, text[start:]))
+    return pieces
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def count_words(text):
+    """Number of words in a span, whatever its script."""
+    total = 0
+    for kind, run in runs(str(text)):
+        total += len(segment_han(run)) if kind == 'han' else 1
+    return total
+
+
+def main():
+    examples = [
+        'you know, uh, i mean',
+        'tu sais, c\'est-à-dire',
+        'أنت تعرف ، يعني',
+        'आपको पता है। मतलब',
+        '你知道，我们的孩子们不能再照顾自己了',
+    ]
+    for text in examples:
+        print(f"{count_words(text):3d}  {text}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+import random
+
+from asr_wer import align, bit_columns, cell, edit_distance
+
+
+def dp_matrix(ref, hyp):
+    d = [[i + j if i == 0 or j == 0 else 0 for j in range(len(hyp) + 1)] for i in range(len(ref) + 1)]
+    for i in range(1, len(ref) + 1):
+        for j in range(1, len(hyp) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (ref[i - 1] != hyp[j - 1]))
+    return d
+
+
+def random_pairs(count=300, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        # Lengths past 64 exercise references wider than one machine word
+        n, m = rng.choice([(rng.randint(0, 12), rng.randint(0, 12)), (rng.randint(60, 90), rng.randint(60, 90))])
+        alphabet = rng.randint(1, 5)
+        yield [rng.randrange(alphabet) for _ in range(n)], [rng.randrange(alphabet) for _ in range(m)]
+
+
+def test_cells_match_plain_dp():
+    for ref, hyp in random_pairs():
+        d = dp_matrix(ref, hyp)
+        assert edit_distance(ref, hyp) == d[-1][-1]
+        if ref:
+            columns = bit_columns(ref, hyp)
+            assert all(cell(columns, i, j) == d[i][j]
+                       for i in range(len(ref) + 1) for j in range(len(hyp) + 1))
+
+
+def test_alignment_is_optimal_and_complete():
+    for ref, hyp in random_pairs():
+        if not ref:
+            continue
+        ops = align(ref, hyp)
+        assert [i for _, i, _ in ops if i is not None] == list(range(len(ref)))
+        assert [j for _, _, j in ops if j is not None] == list(range(len(hyp)))
+        for op, i, j in ops:
+            if op == '=':
+                assert ref[i] == hyp[j]
+            elif op == '*':
+                assert ref[i] != hyp[j]
+        assert sum(op != '=' for op, _, _ in ops) == dp_matrix(ref, hyp)[-1][-1]
@@ -0,0 +1,13 @@
+from find_reannotation_targets import BudgetedSelector
+
+
+def flag(sample_id, severity):
+    return {'ID': sample_id, 'Language': 'DE', 'Severity': severity,
+            'EN_disfluent': '_uh_ ' * 40, 'Text': 'äh ' * 40}
+
+
+def test_minute_budget_keeps_most_severe_flag():
+    selector = BudgetedSelector(max_minutes=0.1)
+    for sample_id, severity in [('a', 1.0), ('b', 2.5), ('c', 0.5)]:
+        selector.add(flag(sample_id, severity))
+    assert [f['ID'] for f in selector.selected()] == ['b']
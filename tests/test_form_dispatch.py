@@ -0,0 +1,64 @@
+import pandas as pd
+
+from annotator_agreement import ORIGINAL, load_campaign, score_campaign
+from form_dispatch import ANNOTATOR_COLUMN, collapse_whitespace, dedupe_items, normalize_source
+
+
+def test_normalize_keeps_terminal_punctuation():
+    assert normalize_source('Uh-huh, yeah.') == normalize_source('uh huh yeah.')
+    assert normalize_source('you know?') != normalize_source('you know.')
+
+
+def test_reannotation_items_fold_only_on_whitespace():
+    texts = pd.DataFrame({'Text': ['no, jo.', 'no,  jo. ', 'No jo.', 'no jo.']})
+    unique, _ = dedupe_items(texts, ['Text'], collapse_whitespace)
+    assert list(unique.index) == [0, 2, 3]
+
+
+def test_wide_export_fans_out_to_folded_rows(tmp_path):
+    targets = pd.DataFrame({
+        'ID': ['sw1_A_1', 'sw1_A_2', 'sw1_B_3', 'sw1_B_4'],
+        'Language': ['CS'] * 4,
+        'Reason': ['missing_underscores'] * 4,
+        'EN_disfluent': ['_Uh_, yeah.', '_Uh_,  yeah.', '_Well_, no?', '_uh_ yeah.'],
+        'Text': ['no, jo.', 'no,  jo.', 'no, ne?', 'No jo.'],
+    })
+    unique, members = dedupe_items(targets, ['EN_disfluent', 'Text'], collapse_whitespace)
+    assert len(unique) == 3
+
+    # Mapping rows as bulk_create_reannotation writes them: one per target row
+    mapping = pd.DataFrame([
+        {'language_code': 'CS', 'form_uid': 'CS_R1', 'question_number': q,
+         'source_id': targets.loc[idx, 'ID'], 'item_key': row['item_key']}
+        for q, (_, row) in enumerate(unique.iterrows(), start=1)
+        for idx in members[row['item_key']]
+    ])
+    mapping_file = tmp_path / 'mapping.csv'
+    mapping.to_csv(mapping_file, index=False)
+
+    # Wide Google Forms export: one column per question, titled by the representative row
+    responses = tmp_path / 'responses'
+    responses.mkdir()
+    pd.DataFrame({
+        'Timestamp': ['t1', 't2'],
+        ANNOTATOR_COLUMN: ['ann1', None],
+        '[sw1_A_1] Annotation 1': ['_no_, jo.', '_no, jo._'],
+        '[sw1_B_3] Annotation 2': ['no, _ne_?', None],
+        '[sw1_B_4] Annotation 3': [None, '_No_ jo.'],
+    }).to_csv(responses / 'CS_R1.csv', index=False)
+
+    data_file = tmp_path / 'data.csv'
+    pd.DataFrame({
+        'ID': ['sw1_A_1', 'sw1_A_2', 'sw1_B_3', 'sw1_B_4'],
+        'CS_disfluent': ['_no_, jo.', '_no_,  jo.', 'no, ne?', '_No_ jo.'],
+    }).to_csv(data_file, index=False)
+
+    markups = load_campaign(str(responses), str(data_file), str(mapping_file))
+    assert set(markups[('sw1_A_2', 'CS')]) == {'ann1', 'CS_R1.csv#2', ORIGINAL}
+    assert set(markups[('sw1_B_4', 'CS')]) == {'CS_R1.csv#2', ORIGINAL}
+
+    pairs, mismatched = score_campaign(markups)
+    assert mismatched == 0
+    folded = pairs[(pairs['ID'] == 'sw1_A_2') & (pairs['Reference'] == ORIGINAL)].set_index('Annotator')
+    assert folded.loc['ann1', 'exact_matches'] == 1
+    assert folded.loc['CS_R1.csv#2', 'exact_matches'] == 0
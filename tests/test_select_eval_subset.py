@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from select_eval_subset import allocate, select_subset
+
+
+def test_allocate_many_small_strata_keeps_total():
+    sizes = [2] * 20 + [200]
+    total = round(sum(sizes) * 0.1)
+    picks = allocate(sizes, total)
+    assert picks.sum() == total
+    assert (picks >= 1).all()
+    assert picks[-1] == total - 20
+
+
+def test_allocate_matches_total_for_random_grids():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        sizes = rng.integers(1, 50, rng.integers(1, 40))
+        total = max(1, round(sizes.sum() * 0.1))
+        picks = allocate(sizes, total)
+        assert picks.sum() == total
+        assert (picks <= sizes).all()
+
+
+def test_select_subset_keeps_every_allocated_pick():
+    features = pd.DataFrame({
+        'ID': [f's{i}' for i in range(30)],
+        'Language': ['DE'] * 30,
+        'Stratum': [f'DE/{i // 3}' for i in range(30)],
+        'Density': np.arange(30) % 3 / 3,
+    })
+    for seed in range(20):
+        subset = select_subset(features, fraction=0.67, seed=seed)
+        assert len(subset) == 20
+        assert subset['ID'].is_unique
@@ -0,0 +1,13 @@
+import numpy as np
+
+from span_clusters import lsh_groups
+
+
+def test_bucket_pairs_do_not_depend_on_first_member():
+    signatures = np.zeros((3, 128), dtype=np.uint32)
+    odd_one = 0
+
+    for order in ([0, 1, 2], [1, 2, 0], [2, 0, 1]):
+        roots = lsh_groups(signatures[order], accept=lambda i, j: odd_one not in (order[i], order[j]))
+        clusters = {frozenset(order[i] for i in range(3) if roots[i] == root) for root in roots}
+        assert clusters == {frozenset({0}), frozenset({1, 2})}
@@ -0,0 +1,19 @@
+from translation_cache import TranslationCache
+
+
+def test_runners_sharing_a_file_share_the_lru_clock(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    a = TranslationCache(path, max_bytes=3)
+    b = TranslationCache(path, max_bytes=3)
+
+    a.put('m', 't', 'x', 'DE', '1')
+    b.put('m', 't', 'y', 'DE', '2')
+    a.put('m', 't', 'z', 'DE', '3')
+    assert b.get('m', 't', 'x', 'DE') == '1'
+
+    # y is now the least recently used entry, whichever runner touched the others
+    a.put('m', 't', 'w', 'DE', '4')
+    outputs = {row[0] for row in a.conn.execute('SELECT output FROM entries')}
+    assert outputs == {'1', '3', '4'}
+    a.close()
+    b.close()
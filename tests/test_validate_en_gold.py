@@ -0,0 +1,25 @@
+import random
+
+from validate_en_gold import myers_diff
+
+
+def lcs_length(a, b):
+    row = [0] * (len(b) + 1)
+    for x in a:
+        prev = 0
+        for j, y in enumerate(b, start=1):
+            prev, row[j] = row[j], prev + 1 if x == y else max(row[j], row[j - 1])
+    return row[-1]
+
+
+def test_myers_diff_matches_plain_dp():
+    rng = random.Random(0)
+    for _ in range(500):
+        a = [rng.randrange(4) for _ in range(rng.randint(0, 20))]
+        b = [rng.randrange(4) for _ in range(rng.randint(0, 20))]
+        ops = myers_diff(a, b)
+
+        assert [i for _, i, _ in ops if i is not None] == list(range(len(a)))
+        assert [j for _, _, j in ops if j is not None] == list(range(len(b)))
+        assert all(a[i] == b[j] for op, i, j in ops if op == '=')
+        assert sum(op != '=' for op, _, _ in ops) == len(a) + len(b) - 2 * lcs_length(a, b)
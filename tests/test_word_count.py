@@ -0,0 +1,12 @@
+from word_count import count_words, han_dictionary
+
+
+def test_long_han_spans_are_not_dictionary_words():
+    assert all(len(word) <= 4 for word in han_dictionary())
+    assert count_words('这是世界上你想做的最后几件事之一') >= 10
+
+
+def test_dictionary_does_not_depend_on_working_directory(tmp_path, monkeypatch):
+    words = han_dictionary()
+    monkeypatch.chdir(tmp_path)
+    assert han_dictionary() == words